@@ -1,7 +1,6 @@
 import streamlit as st
 import os
 import warnings
-import base64
 from datetime import datetime 
 from streamlit_option_menu import option_menu 
 
@@ -15,7 +14,8 @@ import view_guide
 import view_compensation
 import view_stories
 import view_videos
-from utils import load_excel
+from utils import load_excel, start_image_pipeline, get_optimized_image
+from func import record_page_view
 
 # [설정] 경고 무시 및 설정 파일 로드
 from config import *
@@ -70,6 +70,8 @@ if "head_set" not in st.session_state:
 # --------------------------------------------------------------------------
 styles.apply_custom_css()
 all_sheets = load_excel()
+start_image_pipeline() # 이미지 크기별 변환본을 백그라운드에서 미리 생성
+view_pdf.start_pdf_prerender() # 자료실 PDF 페이지를 백그라운드에서 미리 변환
 
 # --------------------------------------------------------------------------
 # [3] 화면 구성 함수들
@@ -81,11 +83,10 @@ def render_home_logo():
         elif os.path.exists("PMAILOGO.png"): logo_path = "PMAILOGO.png"
         
         if logo_path:
-            with open(logo_path, "rb") as f:
-                img_b64 = base64.b64encode(f.read()).decode()
+            logo_src = get_optimized_image(logo_path, width=320)
             st.markdown(f"""
                 <div style="display: flex; justify-content: center; padding-top: 10px; padding-bottom: 0px;">
-                    <img src="data:image/png;base64,{img_b64}" style="width: 120px; object-fit: contain;">
+                    <img src="{logo_src}" style="width: 120px; object-fit: contain;">
                 </div>
             """, unsafe_allow_html=True)
         else:
@@ -140,12 +141,7 @@ def render_top_navigation():
 api_key = GOOGLE_API_KEY
 selected_model = "gemini-2.5-flash"
 
-if api_key:
-    try:
-        import google.generativeai as genai
-        genai.configure(api_key=api_key)
-    except Exception as e:
-        pass
+# (genai 설정은 view_ai.get_gemini_model 에서 프로세스당 한 번만 합니다)
 
 EVENT_IMAGE_URL = "https://raw.githubusercontent.com/baejongwan/pm-ai/main/event_01.png"
 
@@ -179,6 +175,7 @@ if "home_popup_shown" not in st.session_state:
         st.session_state["home_popup_shown"] = True
 
 target_page = st.session_state.page
+record_page_view(target_page)
 
 if target_page == "홈": view_home.render_home_dashboard(all_sheets)
 elif target_page == "AI상담": view_ai.render_ai_assistant(api_key, selected_model, all_sheets)
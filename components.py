@@ -1,4 +1,5 @@
 import streamlit as st
+import re
 
 # 1. CSS 스타일 (시각적 중앙 정렬 보정)
 def apply_custom_styles():
@@ -97,3 +98,30 @@ def number_counter(label, key, default_val, min_val, max_val, unit=""):
         st.markdown(f"<div class='unit-caption'>{unit}</div>", unsafe_allow_html=True)
     
     return val
+
+
+# 3. 유튜브 영상 (썸네일 먼저, 누르면 재생)
+# 유튜브 플레이어(iframe)는 영상마다 스크립트를 많이 받아오므로 목록에서는 썸네일 사진만 보여주고,
+# '재생'을 누른 영상만 진짜 플레이어로 바꿉니다. fragment라서 이 영상 칸만 다시 그립니다.
+YOUTUBE_ID_PATTERN = re.compile(r"(?:youtu\.be/|[?&]v=|/(?:embed|shorts|live)/)([\w-]{11})")
+
+def get_youtube_id(url):
+    match = YOUTUBE_ID_PATTERN.search(str(url or ""))
+    return match.group(1) if match else None
+
+@st.fragment
+def youtube_player(url, key):
+    url = str(url).strip()
+    video_id = get_youtube_id(url)
+    play_key = f"yt_play_{key}"
+
+    # 유튜브가 아닌 링크는 예전처럼 바로 플레이어로
+    if video_id is None or st.session_state.get(play_key):
+        st.video(url, autoplay=video_id is not None)
+        return
+
+    st.image(f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg", use_container_width=True)
+    st.button(
+        "▶ 영상 재생", key=f"yt_btn_{key}", use_container_width=True,
+        on_click=st.session_state.__setitem__, args=(play_key, True)
+    )
@@ -23,6 +23,30 @@ MAIN_CONTACT_PHONE = "010-5089-1615"  # 필요시 수정하세요
 # 엑셀 파일 경로
 EXCEL_FILE_PATH = "pm_data.xlsx"
 
+# AI 요청 시간 제한 (초)
+AI_REQUEST_TIMEOUT = 60   # 한 번 요청할 때 최대 대기 시간
+AI_RETRY_DEADLINE = 90    # 일시적 오류(과부하 등) 재시도를 포함한 전체 한도
+
+# AI 답변을 만들어지는 대로 바로 보여줄지 (False면 다 만들어진 뒤 한 번에 표시)
+AI_STREAM_RESPONSE = True
+
+# AI 상담 프롬프트에 넣을 엑셀 데이터 한도 (대략적인 토큰 수)
+# - 전체 한도를 넘으면 관련도가 낮은 행부터 빠집니다.
+# - 시트별 한도를 0으로 두면 그 시트는 아예 넣지 않습니다.
+# - 시트별 한도는 시트 역할 이름으로 적습니다. (utils.SHEET_ROLES: 시트 이름이 바뀌어도 그대로 적용)
+AI_CONTEXT_TOTAL_TOKENS = 6000
+AI_CONTEXT_DEFAULT_SHEET_TOKENS = 1000
+AI_CONTEXT_SHEET_TOKENS = {
+    "qa": 2500,        # 질의응답
+    "products": 1500,  # 제품설명
+    "stories": 1500,   # 체험사례
+}
+
+# 비슷한 질문 답변 재사용 (같은 연령대/성별/관심사일 때만)
+AI_ANSWER_CACHE_TTL = 60 * 60 * 24      # 24시간 지나면 새로 생성
+AI_ANSWER_CACHE_MAX_ENTRIES = 500       # 최대 저장 개수 (넘치면 오래 안 쓴 것부터 삭제)
+AI_ANSWER_CACHE_SIMILARITY = 0.93       # 0~1, 높을수록 더 비슷해야 재사용 (띄어쓰기/문장부호만 다르면 항상 재사용)
+
 # 로고 파일 경로
 LOGO_FILE_PATH = "home_logo.png"
 
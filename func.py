@@ -2,10 +2,19 @@ import streamlit as st
 import pandas as pd
 import datetime
 import os
-import base64
 import gspread
 import pytz # [추가] 한국 시간 처리를 위해 필요
+import atexit
+import csv
+import io
+import json
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
 from oauth2client.service_account import ServiceAccountCredentials
+from utils import get_optimized_image, get_display_sheets, get_sheet_roles, find_sheet_name
 
 # [0] 한국 시간 구하는 헬퍼 함수
 def get_korea_time():
@@ -16,14 +25,12 @@ def get_korea_time():
 # [1] 배경 이미지 설정 (기존 유지)
 def set_background(image_file):
     if os.path.exists(image_file):
-        with open(image_file, "rb") as f:
-            data = f.read()
-        b64 = base64.b64encode(data).decode()
+        bg_src = get_optimized_image(image_file, width=1280)
         st.markdown(
             f"""
             <style>
             .stApp {{
-                background-image: url("data:image/png;base64,{b64}");
+                background-image: url("{bg_src}");
                 background-size: cover;
                 background-position: center;
                 background-repeat: no-repeat;
@@ -38,75 +45,146 @@ def set_background(image_file):
 def get_sheet_data(all_sheets, keyword):
     if all_sheets is None: return None
     
-    target_df = None
-    if keyword in all_sheets: target_df = all_sheets[keyword]
-    else:
-        for sheet_name in all_sheets.keys():
-            if keyword in sheet_name: 
-                target_df = all_sheets[sheet_name]
-                break
+    # keyword: 역할 이름('products', 'safety' 등, utils.SHEET_ROLES) 또는 시트 이름
+    # 아이콘 이름 치환은 엑셀 로딩 때 끝나 있으므로 (utils.get_display_sheets) 복사 없이 그대로 돌려줍니다.
+    display_sheets = get_display_sheets(all_sheets)
+    sheet_name = get_sheet_roles(all_sheets).get(keyword)
+    if sheet_name is None:
+        sheet_name = find_sheet_name(list(display_sheets.keys()), keyword)
     
-    if target_df is not None:
-        target_df = target_df.replace("keyboard_double_arrow_right", "▶", regex=True)
-        target_df = target_df.replace("smart_toy", "🤖", regex=True)
-        target_df = target_df.replace("check_circle", "✅", regex=True)
-        target_df = target_df.replace("warning", "⚠️", regex=True)
-        return target_df
-        
-    return None
+    return display_sheets.get(sheet_name) if sheet_name else None
+
+def get_raw_sheet(all_sheets, keyword):
+    # get_sheet_data와 같은 방식으로 찾되, 아이콘 이름 치환 전의 원본 시트를 돌려줍니다.
+    # (엑셀 버전별 색인을 만드는 화면들은 all_sheets와 같은 원본을 써야 합니다.)
+    if all_sheets is None: return None
+
+    sheet_name = get_sheet_roles(all_sheets).get(keyword)
+    if sheet_name is None:
+        sheet_name = find_sheet_name(list(all_sheets.keys()), keyword)
+
+    return all_sheets.get(sheet_name) if sheet_name else None
+
+# [3] 방문자 수 카운트 (한국 시간 기준, 로컬 저장 + 구글 시트 동기화)
+# 예전에는 방문자마다 구글 시트에서 찾기/읽기/쓰기(3번 왕복)를 해서 느리고,
+# 동시에 들어오면 숫자가 덮어써져 빠지는 문제가 있었습니다.
+# 이제 로컬 SQLite 파일에서 바로 +1 하고, 백그라운드 작업이 1분마다
+# 오늘 합계를 '방문자수' 시트에 반영합니다. 페이지별 조회수도 같이 기록합니다.
+VISITOR_DB_FILE = "visitor_counts.db"
+VISITOR_SYNC_SECONDS = 60
+VISITOR_KEY = "__visitors__"   # 하루 방문자 수 (페이지 조회수와 구분)
+
+# streamlit은 화면을 다시 그릴 때마다 새 스레드에서 실행하므로, 스레드별 연결은 매번 새로 열립니다.
+# 그래서 프로세스 전체가 연결 1개를 같이 쓰고(잠금으로 한 번에 한 문장씩), 설정/테이블 생성은 처음 1번만 합니다.
+@st.cache_resource
+def _get_visitor_db():
+    conn = sqlite3.connect(VISITOR_DB_FILE, timeout=10, isolation_level=None, check_same_thread=False)
+    # WAL 모드: 쓰는 중에도 읽기가 막히지 않고, +1 한 번이 훨씬 빨라집니다.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS hits (day TEXT, page TEXT, count INTEGER NOT NULL, PRIMARY KEY (day, page))")
+    # base: 처음 동기화할 때 시트에 이미 있던 숫자 / synced: 마지막으로 시트에 쓴 숫자
+    conn.execute("CREATE TABLE IF NOT EXISTS sheet_sync (day TEXT PRIMARY KEY, row INTEGER, base INTEGER NOT NULL, synced INTEGER)")
+    return {"conn": conn, "lock": threading.Lock()}
+
+def _visitor_query(sql, params=()):
+    db = _get_visitor_db()
+    with db["lock"]:
+        return db["conn"].execute(sql, params).fetchall()
+
+def _increment_hit(day, page):
+    return _visitor_query(
+        "INSERT INTO hits (day, page, count) VALUES (?, ?, 1) "
+        "ON CONFLICT (day, page) DO UPDATE SET count = count + 1 RETURNING count",
+        (day, page),
+    )[0][0]
+
+def _get_daily_total(day):
+    local = _visitor_query("SELECT count FROM hits WHERE day = ? AND page = ?", (day, VISITOR_KEY))
+    base = _visitor_query("SELECT base FROM sheet_sync WHERE day = ?", (day,))
+    return (base[0][0] if base else 0) + (local[0][0] if local else 0)
 
-# [3] 방문자 수 카운트 (한국 시간 기준 + 구글 시트 연동)
 def get_daily_visitor_count():
-    from func import get_google_sheet_connection # 연결 함수 재사용
+    _start_visitor_sync()
     
     # [수정] 한국 시간 기준으로 오늘 날짜 가져오기
-    now_kor = get_korea_time()
-    today_str = now_kor.strftime("%Y-%m-%d")
+    today_str = get_korea_time().strftime("%Y-%m-%d")
     
-    # 세션 상태 확인 (새로고침 시 카운트 증가 방지용 1차 방어)
-    if "visited" not in st.session_state:
-        st.session_state.visited = True
+    try:
+        # 세션 상태 확인 (새로고침 시 카운트 증가 방지용 1차 방어)
+        if "visited" not in st.session_state:
+            st.session_state.visited = True
+            _increment_hit(today_str, VISITOR_KEY)
+        return max(_get_daily_total(today_str), 1)
+    except Exception as e:
+        print(f"방문자 카운트 오류: {e}")
+        return 1
+
+def record_page_view(page_name):
+    # 페이지별 조회수 (같은 페이지에서 버튼 누르는 것은 세지 않음)
+    if st.session_state.get("last_counted_page") == page_name:
+        return
+    st.session_state.last_counted_page = page_name
+    try:
+        _increment_hit(get_korea_time().strftime("%Y-%m-%d"), page_name)
+    except Exception as e:
+        print(f"페이지 조회수 기록 오류: {e}")
+
+def get_page_view_counts(day=None):
+    # 관리자 화면용: {페이지: 조회수} (기본은 오늘)
+    day = day or get_korea_time().strftime("%Y-%m-%d")
+    rows = _visitor_query(
+        "SELECT page, count FROM hits WHERE day = ? AND page != ? ORDER BY count DESC", (day, VISITOR_KEY)
+    )
+    return dict(rows)
+
+def sync_visitor_counts():
+    # 아직 시트에 반영 안 된 날짜별 합계를 '방문자수' 시트에 씁니다.
+    days = [row[0] for row in _visitor_query(
+        "SELECT h.day FROM hits h LEFT JOIN sheet_sync s ON h.day = s.day "
+        "WHERE h.page = ? AND (s.synced IS NULL OR s.synced != s.base + h.count)", (VISITOR_KEY,)
+    )]
+    if not days:
+        return
+    
+    sheet = get_worksheet("방문자수")
+    if sheet is None:
+        return
+    for day in days:
+        rows = _visitor_query("SELECT row, base FROM sheet_sync WHERE day = ?", (day,))
+        sync = rows[0] if rows else None
+        if sync is None:
+            # 처음 동기화하는 날짜: 시트에 이미 있는 숫자를 시작값으로 사용 (재배포 후에도 이어서 셈)
+            cell = sheet.find(day)
+            base = int(sheet.cell(cell.row, 2).value or 0) if cell else 0
+            sync = (cell.row if cell else None, base)
+            _visitor_query("INSERT INTO sheet_sync (day, row, base) VALUES (?, ?, ?)", (day, sync[0], sync[1]))
         
+        row, base = sync
+        total = _get_daily_total(day)
+        if row:
+            sheet.update_cell(row, 2, total)
+        else:
+            # 오늘 날짜가 없으면 -> 새로 한 줄 추가
+            sheet.append_row([day, total])
+            found = sheet.find(day)
+            row = found.row if found else None
+        _visitor_query("UPDATE sheet_sync SET row = ?, synced = ? WHERE day = ?", (row, total, day))
+
+def _visitor_sync_loop():
+    while True:
         try:
-            client = get_google_sheet_connection()
-            if client:
-                # 1. '방문자수' 시트 열기
-                try:
-                    sheet = client.open("PM_AI_상담이력").worksheet("방문자수")
-                except:
-                    return 1
-
-                # 2. 오늘 날짜 데이터 찾기
-                cell = sheet.find(today_str)
-                
-                if cell:
-                    # 이미 오늘 날짜가 있으면 -> 카운트 +1
-                    current_count = int(sheet.cell(cell.row, 2).value)
-                    new_count = current_count + 1
-                    sheet.update_cell(cell.row, 2, new_count)
-                    return new_count
-                else:
-                    # 오늘 날짜가 없으면 -> 새로 한 줄 추가
-                    sheet.append_row([today_str, 1])
-                    return 1
-            else:
-                return 1 # 연결 실패 시
+            sync_visitor_counts()
         except Exception as e:
-            print(f"방문자 카운트 오류: {e}")
-            return 1
-            
-    else:
-        # 이미 방문한 상태라면 카운트 늘리지 않고 조회만 시도
-        try:
-            client = get_google_sheet_connection()
-            if client:
-                sheet = client.open("PM_AI_상담이력").worksheet("방문자수")
-                cell = sheet.find(today_str)
-                if cell:
-                    return int(sheet.cell(cell.row, 2).value)
-        except:
-            pass
-        return 1
+            print(f"방문자 수 시트 동기화 오류: {e}")
+            reset_google_sheet_connection()
+        time.sleep(VISITOR_SYNC_SECONDS)
+
+@st.cache_resource
+def _start_visitor_sync():
+    worker = threading.Thread(target=_visitor_sync_loop, daemon=True, name="visitor-sync")
+    worker.start()
+    return worker
 
 # [4] 페이지 이동 (기존 유지)
 def move_to_page(page_name):
@@ -114,20 +192,75 @@ def move_to_page(page_name):
     st.query_params["page"] = page_name
     st.rerun()
 
-# [5] 구글 시트 연결 헬퍼 함수
+# [5] 구글 시트 연결 헬퍼 함수 (프로세스 공용 연결 + 시트 핸들 캐시)
+# 예전에는 호출할 때마다 인증을 새로 하고, 스프레드시트도 제목으로 다시 검색했습니다.
+# 이제 인증된 연결 1개를 모든 세션/백그라운드 작업이 같이 쓰고,
+# 한 번 연 스프레드시트와 워크시트는 ID 기준으로 저장해 두고 재사용합니다.
+# 인증 토큰은 1시간이면 만료되므로 GOOGLE_CONNECTION_MAX_AGE마다 새로 인증합니다.
+SPREADSHEET_NAME = "PM_AI_상담이력"
+GOOGLE_CONNECTION_MAX_AGE = 45 * 60
+
+_sheet_pool = {"client": None, "created": 0, "spreadsheet_ids": {}, "spreadsheets": {}, "worksheets": {}}
+_sheet_pool_lock = threading.RLock()
+
+def _authorize_google_sheet():
+    # Streamlit Secrets에서 키 정보 가져오기
+    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+    creds_dict = st.secrets["gcp_service_account"]
+    creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
+    return gspread.authorize(creds)
+
 def get_google_sheet_connection():
-    try:
-        # Streamlit Secrets에서 키 정보 가져오기
-        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds_dict = st.secrets["gcp_service_account"]
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-        client = gspread.authorize(creds)
-        return client
-    except Exception as e:
-        print(f"구글 시트 연결 실패: {e}")
-        return None
+    with _sheet_pool_lock:
+        if _sheet_pool["client"] is None or time.time() - _sheet_pool["created"] > GOOGLE_CONNECTION_MAX_AGE:
+            try:
+                client = _authorize_google_sheet()
+            except Exception as e:
+                print(f"구글 시트 연결 실패: {e}")
+                return None
+            # 새 연결이면 예전 연결로 연 시트 핸들은 버림
+            _sheet_pool.update(client=client, created=time.time(), spreadsheet_ids={}, spreadsheets={}, worksheets={})
+        return _sheet_pool["client"]
+
+def reset_google_sheet_connection():
+    # 인증 오류 등이 나면 다음 호출 때 처음부터 다시 연결
+    with _sheet_pool_lock:
+        _sheet_pool.update(client=None, created=0, spreadsheet_ids={}, spreadsheets={}, worksheets={})
+
+def get_worksheet(worksheet_name=None, spreadsheet_name=SPREADSHEET_NAME):
+    # worksheet_name이 없으면 첫 번째 시트(sheet1)
+    with _sheet_pool_lock:
+        client = get_google_sheet_connection()
+        if client is None:
+            return None
+        
+        # 1. 스프레드시트: 제목 검색(Drive 조회)은 처음 한 번만, 이후는 ID로 보관
+        spreadsheet_id = _sheet_pool["spreadsheet_ids"].get(spreadsheet_name)
+        if spreadsheet_id is None:
+            spreadsheet = client.open(spreadsheet_name)
+            spreadsheet_id = spreadsheet.id
+            _sheet_pool["spreadsheet_ids"][spreadsheet_name] = spreadsheet_id
+            _sheet_pool["spreadsheets"][spreadsheet_id] = spreadsheet
+        spreadsheet = _sheet_pool["spreadsheets"][spreadsheet_id]
+        
+        # 2. 워크시트 핸들
+        key = (spreadsheet_id, worksheet_name)
+        if key not in _sheet_pool["worksheets"]:
+            _sheet_pool["worksheets"][key] = spreadsheet.worksheet(worksheet_name) if worksheet_name else spreadsheet.sheet1
+        return _sheet_pool["worksheets"][key]
+
+# [6] ★ 사용자 로그 저장 (한국 시간 적용, 백그라운드 전송) ★
+# 예전에는 답변할 때마다 그 자리에서 구글 시트에 한 줄씩 저장해서 사용자가 기다려야 했습니다.
+# 이제 로그는 대기열에 넣기만 하고, 백그라운드 작업자가 모아서(append_rows) 한 번에 보냅니다.
+# 전송이 계속 실패하면 로컬 기록 파일(LOG_JOURNAL_FILE)에 쌓아 두었다가 나중에 다시 보냅니다.
+LOG_BATCH_SIZE = 20          # 이만큼 모이면 바로 전송
+LOG_FLUSH_SECONDS = 5        # 덜 모여도 이 시간이 지나면 전송
+LOG_RETRY_COUNT = 3          # 전송 실패 시 재시도 횟수 (1초, 2초, 4초 간격)
+LOG_REPLAY_SECONDS = 60      # 밀린 기록 재전송 간격
+LOG_JOURNAL_FILE = "log_journal.jsonl"
+LOG_JOURNAL_BAD_FILE = "log_journal.bad"   # 읽을 수 없는 줄(저장 도중 꺼진 경우 등)은 여기로 옮김
+LEGACY_BACKUP_FILE = "backup_logs.csv"
 
-# [6] ★ 사용자 로그 저장 (한국 시간 적용) ★
 def save_user_log(user_info, question, answer):
     # [수정] 한국 시간 적용
     now_kor = get_korea_time()
@@ -137,27 +270,216 @@ def save_user_log(user_info, question, answer):
     gender = user_info.get("gender", "-")
     conditions = ", ".join(user_info.get("conditions", []))
     
-    # 저장할 데이터 한 줄
+    # 저장할 데이터 한 줄 -> 대기열에 넣고 바로 돌아감
     row_data = [timestamp, age, gender, conditions, question, answer]
+    _get_log_writer().put(row_data)
+
+def _append_log_rows(rows):
+    sheet = get_worksheet()
+    if not sheet:
+        raise RuntimeError("구글 시트 클라이언트 없음")
+    sheet.append_rows(rows)
+
+def _ship_log_rows(rows):
+    delay = 1
+    for attempt in range(1, LOG_RETRY_COUNT + 1):
+        try:
+            _append_log_rows(rows)
+            print(f"✅ 구글 시트 저장 성공 ({len(rows)}건)")
+            return True
+        except Exception as e:
+            print(f"❌ 구글 시트 저장 중 오류 ({attempt}/{LOG_RETRY_COUNT}): {e}")
+            reset_google_sheet_connection()
+            if attempt < LOG_RETRY_COUNT:
+                time.sleep(delay)
+                delay *= 2
+    return False
+
+def _write_journal(rows):
+    text = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+    # 이전에 쓰다가 끊긴 줄이 있으면 새 기록이 그 뒤에 붙지 않도록 줄을 바꿔 줌
+    if os.path.exists(LOG_JOURNAL_FILE) and os.path.getsize(LOG_JOURNAL_FILE) > 0:
+        with open(LOG_JOURNAL_FILE, 'rb') as file:
+            file.seek(-1, os.SEEK_END)
+            if file.read(1) != b"\n":
+                text = "\n" + text
+    with open(LOG_JOURNAL_FILE, mode='a', encoding='utf-8') as file:
+        file.write(text)
+
+def _read_journal():
+    if not os.path.exists(LOG_JOURNAL_FILE):
+        return []
+    rows, bad_lines = [], []
+    with open(LOG_JOURNAL_FILE, encoding='utf-8', errors='replace') as file:
+        for line in file:
+            if not line.strip(): continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            if isinstance(row, list):
+                rows.append(row)
+            else:
+                bad_lines.append(line if line.endswith("\n") else line + "\n")
     
+    # 깨진 줄은 따로 보관하고 건너뜀 (한 줄 때문에 전체 전송이 막히지 않도록)
+    if bad_lines:
+        print(f"⚠️ 로그 기록 파일에서 읽을 수 없는 줄 {len(bad_lines)}개를 {LOG_JOURNAL_BAD_FILE}로 옮깁니다.")
+        with open(LOG_JOURNAL_BAD_FILE, mode='a', encoding='utf-8') as file:
+            file.writelines(bad_lines)
+        # 기록 파일은 읽을 수 있는 줄만 남겨 다시 저장 (임시 파일에 쓴 뒤 교체)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(LOG_JOURNAL_FILE)), suffix=".tmp")
+        with os.fdopen(fd, mode='w', encoding='utf-8') as file:
+            file.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+        os.replace(tmp_path, LOG_JOURNAL_FILE)
+    return rows
+
+def _import_legacy_backup():
+    # 예전 방식(backup_logs.csv)으로 남아 있던 기록도 재전송 대상으로 옮깁니다.
+    if not os.path.exists(LEGACY_BACKUP_FILE):
+        return
+    with open(LEGACY_BACKUP_FILE, newline='', encoding='utf-8-sig') as file:
+        rows = [row for row in csv.reader(file) if row]
+    _write_journal(rows)
+    os.replace(LEGACY_BACKUP_FILE, LEGACY_BACKUP_FILE + ".imported")
+
+def _log_writer_loop(log_queue):
     try:
-        # 1. 구글 시트 연결
-        client = get_google_sheet_connection()
-        if client:
-            # 2. 스프레드시트 열기
-            sheet = client.open("PM_AI_상담이력").sheet1
-            
-            # 3. 데이터 추가
-            sheet.append_row(row_data)
-            print("✅ 구글 시트 저장 성공")
-        else:
-            print("❌ 구글 시트 클라이언트 없음")
-            
+        _import_legacy_backup()
     except Exception as e:
-        print(f"❌ 구글 시트 저장 중 오류: {e}")
-        # 실패 시 비상용으로 로컬 파일에도 시도 (백업)
-        import csv
-        file_name = "backup_logs.csv"
-        with open(file_name, mode='a', newline='', encoding='utf-8-sig') as file:
-            writer = csv.writer(file)
-            writer.writerow(row_data)
+        print(f"예전 백업 로그 가져오기 실패: {e}")
+    
+    next_replay = 0
+    while True:
+        # 1. BATCH_SIZE개가 모이거나 FLUSH_SECONDS가 지날 때까지 모으기
+        batch = []
+        deadline = time.time() + LOG_FLUSH_SECONDS
+        while len(batch) < LOG_BATCH_SIZE:
+            timeout = deadline - time.time()
+            if timeout <= 0: break
+            try:
+                batch.append(log_queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        
+        # 2. 새 기록이 없으면, 밀린 기록 재전송 시간이 됐을 때만 전송
+        has_journal = os.path.exists(LOG_JOURNAL_FILE)
+        if not batch and not (has_journal and time.time() >= next_replay):
+            continue
+        
+        # 3. 밀린 기록 + 새 기록을 한 번에 전송
+        shipped = False
+        try:
+            pending = _read_journal() + batch
+            shipped = _ship_log_rows(pending)
+            if shipped and has_journal: os.remove(LOG_JOURNAL_FILE)
+        except Exception as e:
+            print(f"로그 작업자 오류: {e}")
+        
+        if not shipped:
+            # 실패(오류 포함) 시 새 기록도 로컬 기록 파일에 쌓아 두기 (밀린 기록은 이미 들어 있음)
+            try:
+                if batch: _write_journal(batch)
+            except Exception as e:
+                print(f"로그 기록 파일 저장 실패 ({len(batch)}건): {e}")
+            next_replay = time.time() + LOG_REPLAY_SECONDS
+
+def _spill_queue_to_journal(log_queue):
+    # 서버 종료 시 아직 못 보낸 기록을 파일에 남김
+    rows = []
+    while True:
+        try: rows.append(log_queue.get_nowait())
+        except queue.Empty: break
+    if rows: _write_journal(rows)
+
+@st.cache_resource
+def _get_log_writer():
+    # 프로세스당 1개의 대기열 + 작업자 스레드
+    log_queue = queue.Queue()
+    worker = threading.Thread(target=_log_writer_loop, args=(log_queue,), daemon=True, name="log-writer")
+    worker.start()
+    atexit.register(_spill_queue_to_journal, log_queue)
+    return log_queue
+
+# [7] 관리자용 상담 이력 로컬 사본 (새로 추가된 줄만 가져오기)
+# 예전에는 관리자 화면을 열 때마다 시트 전체(get_all_records)를 받아서 pandas로 정렬했습니다.
+# 이제 로컬 SQLite에 사본을 두고, 마지막으로 가져온 줄 다음부터만 받아옵니다.
+# 검색 조건/페이지 나누기는 SQL로 처리해서 필요한 만큼만 꺼냅니다.
+ADMIN_LOG_DB_FILE = "admin_logs.db"
+ADMIN_LOG_COLUMNS = ["날짜시간", "나이", "성별", "건강상태", "질문내용", "AI답변"]
+
+# 방문자 수 DB와 같은 방식: 프로세스 공용 연결 1개 + 잠금, 설정/테이블 생성은 처음 1번만
+@st.cache_resource
+def _get_admin_log_db():
+    conn = sqlite3.connect(ADMIN_LOG_DB_FILE, timeout=10, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # row: 구글 시트의 줄 번호 (1번 줄은 제목)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS logs (row INTEGER PRIMARY KEY, ts TEXT, age TEXT, "
+        "gender TEXT, conditions TEXT, question TEXT, answer TEXT)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS logs_ts ON logs (ts)")
+    return {"conn": conn, "lock": threading.Lock()}
+
+def _admin_log_query(sql, params=()):
+    db = _get_admin_log_db()
+    with db["lock"]:
+        return db["conn"].execute(sql, params).fetchall()
+
+def sync_admin_logs():
+    """새로 추가된 줄만 가져와 로컬 사본에 저장합니다. 연결 실패 시 None."""
+    sheet = get_worksheet()
+    if sheet is None:
+        return None
+    last_row = _admin_log_query("SELECT COALESCE(MAX(row), 1) FROM logs")[0][0]
+    new_rows = sheet.get(f"A{last_row + 1}:F")
+    records = []
+    for offset, values in enumerate(new_rows, start=1):
+        values = (list(values) + [""] * 6)[:6]
+        records.append((last_row + offset, *values))
+    db = _get_admin_log_db()
+    with db["lock"]:
+        db["conn"].executemany("INSERT OR REPLACE INTO logs VALUES (?, ?, ?, ?, ?, ?, ?)", records)
+    return len(records)
+
+def reset_admin_logs():
+    # 시트에서 줄을 지웠거나 고쳤을 때: 로컬 사본을 비우고 처음부터 다시 받기
+    _admin_log_query("DELETE FROM logs")
+
+def _admin_log_where(filters):
+    clauses, params = ["ts != ''"], []
+    if filters.get("date_from"):
+        clauses.append("substr(ts, 1, 10) >= ?"); params.append(filters["date_from"])
+    if filters.get("date_to"):
+        clauses.append("substr(ts, 1, 10) <= ?"); params.append(filters["date_to"])
+    if filters.get("age_group"):
+        clauses.append("CAST(age AS INTEGER) / 10 * 10 = ?"); params.append(int(filters["age_group"]))
+    if filters.get("gender"):
+        clauses.append("gender = ?"); params.append(filters["gender"])
+    if filters.get("condition"):
+        clauses.append("conditions LIKE ?"); params.append(f"%{filters['condition']}%")
+    return " AND ".join(clauses), params
+
+def count_admin_logs(filters):
+    where, params = _admin_log_where(filters)
+    return _admin_log_query(f"SELECT COUNT(*) FROM logs WHERE {where}", params)[0][0]
+
+def query_admin_logs(filters, limit, offset=0):
+    where, params = _admin_log_where(filters)
+    rows = _admin_log_query(
+        f"SELECT ts, age, gender, conditions, question, answer FROM logs WHERE {where} "
+        "ORDER BY ts DESC LIMIT ? OFFSET ?", params + [limit, offset]
+    )
+    return pd.DataFrame(rows, columns=ADMIN_LOG_COLUMNS)
+
+def export_admin_logs_csv(filters):
+    # 다운로드 버튼을 눌렀을 때만 만들어지는 CSV (엑셀에서 한글이 깨지지 않도록 BOM 포함)
+    # streamlit이 받은 데이터를 통째로 메모리에 올려 보내므로 bytes로 돌려줍니다.
+    where, params = _admin_log_where(filters)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(ADMIN_LOG_COLUMNS)
+    writer.writerows(_admin_log_query(
+        f"SELECT ts, age, gender, conditions, question, answer FROM logs WHERE {where} ORDER BY ts DESC", params
+    ))
+    return buffer.getvalue().encode('utf-8-sig')
@@ -0,0 +1,22 @@
+# pdf_render.py (PDF 페이지 -> JPEG 변환)
+# 자료실 미리 변환 프로세스가 이 모듈만 불러오도록 fitz 외에는 아무것도 임포트하지 않습니다.
+# (view_pdf를 불러오면 utils를 거쳐 streamlit/pandas/PIL까지 프로세스마다 올라갑니다.)
+import os
+import tempfile
+
+JPEG_QUALITY = 85
+
+def render_page_to_file(file_path, page_index, dpi, page_path):
+    import fitz  # pymupdf
+    with fitz.open(file_path) as doc:
+        pix = doc[page_index].get_pixmap(dpi=dpi)
+        image_bytes = pix.tobytes("jpeg", jpg_quality=JPEG_QUALITY)
+
+    # 임시 파일에 쓴 뒤 교체 (동시에 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록)
+    cache_dir = os.path.dirname(page_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(image_bytes)
+    os.replace(tmp_path, page_path)
+    return page_path
@@ -0,0 +1,116 @@
+# search.py (한국어 글자 n-gram 검색 색인)
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+# --------------------------------------------------------------------------
+# [1] 텍스트 정규화 및 n-gram 분해
+# --------------------------------------------------------------------------
+# 한국어는 조사/어미가 붙어서 단어 단위로 자르면 '변비가', '변비는'이 서로 다른 말이 됩니다.
+# 그래서 단어를 2~3글자 조각(n-gram)으로 잘라 비교합니다. ('변비가' -> '변비', '비가', '변비가')
+NGRAM_SIZES = (2, 3)
+
+# BM25 가중치 (일반적으로 쓰는 기본값)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+def normalize_text(text):
+    if text is None:
+        return ""
+    text = unicodedata.normalize("NFKC", str(text)).lower()
+    if text == "nan":
+        return ""
+    return re.sub(r"\s+", " ", text).strip()
+
+def tokenize(text):
+    grams = []
+    for word in re.findall(r"\w+", normalize_text(text)):
+        if len(word) < NGRAM_SIZES[0]:
+            grams.append(word)
+            continue
+        for n in NGRAM_SIZES:
+            grams.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return grams
+
+# --------------------------------------------------------------------------
+# [2] 색인 만들기 / 검색 (BM25)
+# --------------------------------------------------------------------------
+def build_index(documents):
+    """문자열 리스트로 색인을 만듭니다. 검색 결과는 리스트 위치(번호)로 돌려줍니다."""
+    postings = defaultdict(dict)   # 조각 -> {문서번호: 등장횟수}
+    doc_lengths = []
+    for doc_id, text in enumerate(documents):
+        counts = Counter(tokenize(text))
+        doc_lengths.append(sum(counts.values()))
+        for gram, freq in counts.items():
+            postings[gram][doc_id] = freq
+
+    total = len(doc_lengths)
+    idf = {
+        gram: math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+        for gram, docs in postings.items()
+    }
+    return {
+        "postings": dict(postings),
+        "idf": idf,
+        "doc_lengths": doc_lengths,
+        "avg_length": (sum(doc_lengths) / total) if total else 0,
+    }
+
+def search(index, query, top_k=10):
+    """[(문서번호, 점수), ...]를 점수 높은 순으로 돌려줍니다."""
+    scores = defaultdict(float)
+    avg_length = index["avg_length"] or 1
+    for gram, query_freq in Counter(tokenize(query)).items():
+        docs = index["postings"].get(gram)
+        if not docs:
+            continue
+        idf = index["idf"][gram]
+        for doc_id, freq in docs.items():
+            length_norm = 1 - BM25_B + BM25_B * index["doc_lengths"][doc_id] / avg_length
+            scores[doc_id] += query_freq * idf * freq * (BM25_K1 + 1) / (freq + BM25_K1 * length_norm)
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return ranked[:top_k] if top_k else ranked
+
+# --------------------------------------------------------------------------
+# [3] 한글 자모 / 초성 검색
+# --------------------------------------------------------------------------
+# 글자를 자모로 풀어 두면 입력 중인 글자('두ㅌ', '둩')로도 '두통'을 찾을 수 있고,
+# 초성만 입력해도('ㄷㅌ') 찾을 수 있습니다.
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+# 겹받침은 두 글자로 나눠야 입력 도중('달' -> '닭')에도 이어서 찾을 수 있습니다.
+JONGSEONG = ("", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+             "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+HANGUL_START, HANGUL_END = 0xAC00, 0xD7A3
+
+def _compact(text):
+    # 자모 비교용: NFKC는 호환 자모(ㄱ)를 다른 글자로 바꾸므로 쓰지 않고, 공백만 없앱니다.
+    if text is None:
+        return ""
+    return re.sub(r"\s+", "", str(text)).lower()
+
+def decompose_hangul(text):
+    letters = []
+    for char in _compact(text):
+        code = ord(char)
+        if HANGUL_START <= code <= HANGUL_END:
+            offset = code - HANGUL_START
+            letters.append(CHOSEONG[offset // 588])
+            letters.append(JUNGSEONG[(offset % 588) // 28])
+            letters.append(JONGSEONG[offset % 28])
+        else:
+            letters.append(char)
+    return "".join(letters)
+
+def get_choseong(text):
+    return "".join(
+        CHOSEONG[(ord(char) - HANGUL_START) // 588] if HANGUL_START <= ord(char) <= HANGUL_END else char
+        for char in _compact(text)
+    )
+
+def is_choseong_query(query):
+    query = _compact(query)
+    return bool(query) and all(char in CHOSEONG for char in query)
@@ -2,30 +2,102 @@ import streamlit as st
 import pandas as pd
 import os
 import base64
-from io import BytesIO
 import glob
+import hashlib
+import pickle
+import re
+import tempfile
+import threading
+import time
+from collections import Counter, deque
 
 # (1) 이미지 처리 라이브러리 (Pillow) 확인
 try:
-    from PIL import Image
+    from PIL import Image, features
     HAS_PIL = True
 except ImportError:
     HAS_PIL = False
 
+# --------------------------------------------------------------------------
+# [0] 이미지 파일 이름 색인 (소문자 파일명 -> 경로)
+# --------------------------------------------------------------------------
+# 예전에는 이미지 하나 찾을 때마다 os.walk로 폴더 전체(.git 포함)를 뒤졌습니다.
+# 이제 처음 한 번만 색인을 만들고, 폴더 수정시각이 바뀌면(파일 추가/삭제) 다시 만듭니다.
+_image_index = {"dirs": {}, "files": {}}
+_image_index_lock = threading.Lock()
+
+# 찾지 못한 이미지 이름 -> 횟수 (엑셀 '이미지주소' 오타 확인용)
+# get_optimized_image가 부를 때마다 셉니다 (캐시된 결과를 돌려줄 때도 포함).
+image_miss_counter = Counter()
+_image_miss_lock = threading.Lock()
+
+def _build_image_index():
+    dir_mtimes, files = {}, {}
+    for root, dirs, file_names in os.walk("."):
+        # .git, .cache 같은 숨김 폴더, __pycache__, 이미지 변환본 폴더는 건너뜁니다.
+        dirs[:] = [
+            d for d in dirs
+            if not d.startswith(".") and d != "__pycache__"
+            and os.path.normpath(os.path.join(root, d)) != IMAGE_CACHE_DIR
+        ]
+        dir_mtimes[root] = os.stat(root).st_mtime_ns
+        for file in file_names:
+            # 같은 이름이 여러 개면 먼저 찾은 파일 우선 (예전 os.walk 순서와 동일)
+            files.setdefault(file.lower(), os.path.join(root, file))
+    return {"dirs": dir_mtimes, "files": files}
+
+def _image_index_is_stale():
+    if not _image_index["dirs"]:
+        return True
+    for folder, mtime in _image_index["dirs"].items():
+        try:
+            if os.stat(folder).st_mtime_ns != mtime:
+                return True
+        except OSError:
+            return True
+    return False
+
+def _build_image_index_if_stale():
+    global _image_index
+    with _image_index_lock:
+        if _image_index_is_stale():
+            _image_index = _build_image_index()
+
+def find_image_file(file_name):
+    _build_image_index_if_stale()
+    return _image_index["files"].get(file_name.lower())
+
+def _count_image_miss(file_name):
+    with _image_miss_lock:
+        image_miss_counter[file_name] += 1
+
+def get_image_miss_stats():
+    # 많이 못 찾은 순서대로 [(파일명, 횟수), ...]
+    return image_miss_counter.most_common()
+
 # --------------------------------------------------------------------------
 # [1] 만능 이미지 찾기 함수 (이게 없어서 오류가 난 것입니다)
 # --------------------------------------------------------------------------
+# width : 화면에 표시될 크기에 맞춰 고르세요 (IMAGE_WIDTHS 중 하나, 기본 640)
+def get_optimized_image(file_path, width=640):
+    image_src, missing_name = _get_optimized_image(file_path, width)
+    # 못 찾은 이미지는 캐시 바깥에서 세야 실제로 몇 번 불렸는지 알 수 있습니다.
+    if missing_name:
+        _count_image_miss(missing_name)
+    return image_src
+
 @st.cache_data
-def get_optimized_image(file_path):
+def _get_optimized_image(file_path, width):
+    # (이미지 주소, 못 찾은 파일 이름 또는 None)을 돌려줍니다.
     # 1. 값이 없으면 하트 아이콘 반환
     if not file_path or str(file_path) == 'nan' or str(file_path).strip() == "":
-        return "https://cdn-icons-png.flaticon.com/512/833/833472.png"
+        return "https://cdn-icons-png.flaticon.com/512/833/833472.png", None
     
     file_str = str(file_path).strip()
     
     # 2. 인터넷 주소(http)라면 바로 반환
     if "http" in file_str: 
-        return file_str
+        return file_str, None
     
     # 3. 경로 떼고 '파일 이름'만 추출
     if "\\" in file_str:
@@ -37,42 +109,165 @@ def get_optimized_image(file_path):
         
     target_lower = target_name.lower() # 소문자로 변환해서 비교
 
-    # 4. 현재 폴더를 뒤져서 실제 파일 찾기
-    found_path = None
-    for root, dirs, files in os.walk("."): 
-        for file in files:
-            if file.lower() == target_lower:
-                found_path = os.path.join(root, file)
-                break
-        if found_path: break
+    # 4. 파일 이름 색인에서 실제 파일 찾기
+    found_path = find_image_file(target_lower)
+    if found_path is None:
+        return "https://cdn-icons-png.flaticon.com/512/833/833472.png", target_lower
     
-    # 5. 파일을 찾았다면 이미지로 변환 (Base64)
+    # 5. 파일을 찾았다면 미리 만들어 둔 변환본을 전달
+    #    (정적 파일 서빙이 켜져 있으면 URL, 아니면 Base64)
     if found_path:
         try:
-            if HAS_PIL:
-                with Image.open(found_path) as img:
-                    img.thumbnail((600, 600))  # 용량 최적화
-                    buffered = BytesIO()
-                    img.save(buffered, format="PNG")
-                    img_str = base64.b64encode(buffered.getvalue()).decode()
-                    return f"data:image/png;base64,{img_str}"
+            variant_path = get_image_variant(found_path, width)
+            if variant_path and is_static_serving_enabled():
+                return STATIC_URL_PREFIX + os.path.basename(variant_path), None
+            elif variant_path:
+                with open(variant_path, "rb") as f:
+                    img_str = base64.b64encode(f.read()).decode()
+                return f"data:{IMAGE_MIME};base64,{img_str}", None
             else:
                 # PIL이 없으면 그냥 파일 읽기
                 with open(found_path, "rb") as f:
                     data = f.read()
-                    return f"data:image/png;base64,{base64.b64encode(data).decode()}"
+                    return f"data:image/png;base64,{base64.b64encode(data).decode()}", None
         except Exception:
             pass # 변환 실패 시 하트로
 
     # 6. 끝까지 못 찾으면 하트 반환
-    return "https://cdn-icons-png.flaticon.com/512/833/833472.png"
+    return "https://cdn-icons-png.flaticon.com/512/833/833472.png", None
 
 # --------------------------------------------------------------------------
-# [2] 엑셀 파일 로딩 (pm_data.xlsx 지정 및 캐시 최적화)
+# [1-1] 이미지 변환본 저장소 (크기별 WebP, 내용 해시로 파일 이름 결정)
 # --------------------------------------------------------------------------
-# ttl=600 : 10분마다 엑셀 파일을 새로 읽어오라는 뜻입니다 (캐시 갱신)
-@st.cache_data(ttl=600) 
-def load_excel():
+# 원본 PNG는 장당 1~2.5MB라서 요청 중에 PIL로 열고 줄이면 느립니다.
+# 서버 시작 시 백그라운드에서 모든 이미지를 크기별로 미리 변환해 두고,
+# 화면에서는 이미 만들어진 파일을 읽기만 합니다. (미리 만들기: python utils.py)
+#
+# 변환본은 static/img 에 저장됩니다. .streamlit/config.toml 에서
+# enableStaticServing 이 켜져 있으면 /app/static/img/... 주소로 내려주므로
+# 매번 Base64로 다시 보내지 않고 브라우저가 캐시할 수 있습니다.
+# (파일 이름에 내용 해시가 들어가므로 이미지가 바뀌면 주소도 바뀝니다.)
+IMAGE_CACHE_DIR = os.path.join("static", "img")
+STATIC_URL_PREFIX = "/app/static/img/"
+IMAGE_WIDTHS = (320, 640, 1280)
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+
+# WebP를 지원하지 않는 Pillow라면 JPEG로 저장합니다.
+if HAS_PIL and features.check("webp"):
+    IMAGE_FORMAT, IMAGE_MIME, IMAGE_SUFFIX = "WEBP", "image/webp", ".webp"
+else:
+    IMAGE_FORMAT, IMAGE_MIME, IMAGE_SUFFIX = "JPEG", "image/jpeg", ".jpg"
+
+def is_static_serving_enabled():
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+def _pick_width(width):
+    # 요청한 크기 이상인 것 중 가장 작은 변환본 (없으면 가장 큰 것)
+    for candidate in IMAGE_WIDTHS:
+        if candidate >= width:
+            return candidate
+    return IMAGE_WIDTHS[-1]
+
+def _variant_path(source_path, width):
+    return os.path.join(IMAGE_CACHE_DIR, f"{get_file_hash(source_path)}_{width}{IMAGE_SUFFIX}")
+
+def _prepare_for_save(img):
+    if IMAGE_FORMAT == "JPEG":
+        # JPEG는 투명도가 없으므로 흰 배경 위에 합성
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.split()[-1])
+        return background
+    if img.mode not in ("RGB", "RGBA"):
+        return img.convert("RGBA")
+    return img
+
+def build_image_variants(source_path):
+    """원본 하나를 IMAGE_WIDTHS 크기별로 변환해 저장합니다. 이미 있으면 건너뜁니다."""
+    missing = [w for w in IMAGE_WIDTHS if not os.path.exists(_variant_path(source_path, w))]
+    if not missing or not HAS_PIL:
+        return
+    
+    os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+    with Image.open(source_path) as img:
+        img = _prepare_for_save(img)
+        for width in missing:
+            resized = img.copy()
+            resized.thumbnail((width, width))
+            fd, tmp_path = tempfile.mkstemp(dir=IMAGE_CACHE_DIR, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    resized.save(f, format=IMAGE_FORMAT, quality=85)
+                os.replace(tmp_path, _variant_path(source_path, width))
+            except BaseException:
+                # static/img는 그대로 공개되는 폴더이므로 쓰다 만 임시 파일을 남기지 않음
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+def get_image_variant(source_path, width=640):
+    # 변환본 경로를 돌려줍니다. 아직 없으면(백그라운드 변환 전) 그 자리에서 만듭니다.
+    if not HAS_PIL:
+        return None
+    variant_path = _variant_path(source_path, _pick_width(width))
+    if not os.path.exists(variant_path):
+        build_image_variants(source_path)
+    return variant_path
+
+def _remove_stale_image_temps(min_age=60):
+    # 변환 도중 서버가 꺼지면 임시 파일이 남습니다. (방금 만든 것은 다른 곳에서 쓰는 중일 수 있어 제외)
+    for tmp_path in glob.glob(os.path.join(IMAGE_CACHE_DIR, "*.tmp")):
+        try:
+            if time.time() - os.path.getmtime(tmp_path) > min_age:
+                os.remove(tmp_path)
+        except OSError:
+            pass
+
+def build_all_image_variants():
+    _remove_stale_image_temps()
+    _build_image_index_if_stale()
+    for source_path in sorted(set(_image_index["files"].values())):
+        if not source_path.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        try:
+            build_image_variants(source_path)
+        except Exception as e:
+            print(f"이미지 변환 실패 ({source_path}): {e}")
+
+@st.cache_resource
+def start_image_pipeline():
+    # 서버(프로세스)당 한 번만 백그라운드 변환을 시작합니다.
+    worker = threading.Thread(target=build_all_image_variants, daemon=True, name="image-variants")
+    worker.start()
+    return worker
+
+# --------------------------------------------------------------------------
+# [2] 엑셀 파일 로딩 (pm_data.xlsx 지정 + 스냅샷 캐시)
+# --------------------------------------------------------------------------
+# openpyxl로 엑셀을 읽는 데는 수 초가 걸립니다 (체험사례 시트만 13MB).
+# 그래서 한 번 읽은 결과를 .cache 폴더에 pickle 스냅샷으로 저장해 두고,
+# 원본 엑셀 내용(해시)이 바뀌었을 때만 다시 변환합니다.
+# 배포 직후 미리 만들어 두려면: python utils.py
+SNAPSHOT_DIR = ".cache"
+
+# (파일경로, 수정시각, 크기) -> 해시. 파일이 그대로면 다시 읽지 않습니다.
+_file_hash_memo = {}
+
+def get_file_hash(file_path):
+    stat = os.stat(file_path)
+    signature = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    if signature not in _file_hash_memo:
+        hasher = hashlib.sha1()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(chunk)
+        _file_hash_memo[signature] = hasher.hexdigest()[:16]
+    return _file_hash_memo[signature]
+
+def find_excel_file():
     # 1. 파일 이름 지정 (pm_data.xlsx)
     target_file = "pm_data.xlsx"
     
@@ -82,24 +277,233 @@ def load_excel():
         if excel_files:
             target_file = excel_files[0]
         else:
-            return {} # 파일이 아예 없으면 빈 딕셔너리 반환
+            return None
+    return target_file
 
-    # 3. 엑셀 읽기
+def _read_excel_sheets(target_file):
+    # sheet_name=None으로 하면 모든 시트를 다 읽어옵니다.
+    df_dict = pd.read_excel(target_file, sheet_name=None, engine='openpyxl')
+    
+    # [중요] 시트 이름의 앞뒤 공백 제거 (실수 방지)
+    # 예: " 제품포인트 " -> "제품포인트" 로 자동 수정
+    cleaned_dict = {}
+    for key, value in df_dict.items():
+        cleaned_dict[key.strip()] = value
+    return cleaned_dict
+
+def _snapshot_path(target_file, version):
+    base_name = os.path.splitext(os.path.basename(target_file))[0]
+    return os.path.join(SNAPSHOT_DIR, f"{base_name}.{version}.pkl")
+
+def load_excel_snapshot(target_file):
+    """엑셀 스냅샷을 (버전, 시트 딕셔너리)로 돌려줍니다. 없으면 만들어서 저장합니다."""
+    version = get_file_hash(target_file)
+    snapshot_path = _snapshot_path(target_file, version)
+    
+    # 1. 이미 변환된 스냅샷이 있으면 바로 읽기 (수 ms)
+    if os.path.exists(snapshot_path):
+        try:
+            with open(snapshot_path, "rb") as f:
+                return version, pickle.load(f)
+        except Exception as e:
+            print(f"엑셀 스냅샷 손상, 다시 변환합니다: {e}")
+    
+    # 2. 없으면 엑셀을 파싱한 뒤 스냅샷으로 저장
+    sheets = _read_excel_sheets(target_file)
     try:
-        # sheet_name=None으로 하면 모든 시트를 다 읽어옵니다.
-        df_dict = pd.read_excel(target_file, sheet_name=None, engine='openpyxl')
-        
-        # [중요] 시트 이름의 앞뒤 공백 제거 (실수 방지)
-        # 예: " 제품포인트 " -> "제품포인트" 로 자동 수정
-        cleaned_dict = {}
-        for key, value in df_dict.items():
-            cleaned_dict[key.strip()] = value
-            
-        return cleaned_dict
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        # 임시 파일에 쓴 뒤 교체 (동시에 읽는 세션이 깨진 파일을 보지 않도록)
+        fd, tmp_path = tempfile.mkstemp(dir=SNAPSHOT_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(sheets, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, snapshot_path)
         
+        # 예전 버전 스냅샷 정리
+        base_name = os.path.splitext(os.path.basename(target_file))[0]
+        for old_path in glob.glob(os.path.join(SNAPSHOT_DIR, f"{base_name}.*.pkl")):
+            if old_path != snapshot_path:
+                os.remove(old_path)
     except Exception as e:
-        st.error(f"엑셀 파일 로딩 실패 ({target_file}): {e}")
-        return {}
+        print(f"엑셀 스냅샷 저장 실패: {e}")
+    return version, sheets
+
+# --------------------------------------------------------------------------
+# [2-1] 백그라운드 엑셀 감시 (이전 버전을 보여주다가 새 버전으로 교체)
+# --------------------------------------------------------------------------
+# 예전에는 ttl=600 때문에 10분마다 한 명의 방문자가 엑셀 재로딩을 기다렸습니다.
+# 이제는 감시 스레드가 파일 수정시각을 주기적으로 확인하고, 바뀌었으면
+# 뒤에서 새로 읽은 다음 한 번에 교체합니다. 화면은 교체 전까지 이전 데이터를 씁니다.
+EXCEL_POLL_SECONDS = 30
+# 교체 직전 버전도 몇 개 기억해 둡니다. 화면을 그리던 중에 교체돼도
+# 그 화면이 받은 시트의 버전을 정확히 찾기 위해서입니다 (get_excel_version).
+SNAPSHOT_HISTORY = 3
+
+def _stat_excel_file():
+    target_file = find_excel_file()
+    if target_file is None:
+        return None, None
+    return target_file, os.stat(target_file).st_mtime_ns
+
+def _refresh_workbook(store):
+    target_file, mtime = _stat_excel_file()
+    if target_file is None or (target_file, mtime) == store["source"]:
+        return False
+    
+    version, sheets = load_excel_snapshot(target_file)
+    display_sheets = {name: normalize_icon_tokens(df) for name, df in sheets.items()}
+    sheet_roles = resolve_sheet_roles(list(sheets.keys()))
+    # (버전, 시트, 화면용 시트, 역할) 튜플을 통째로 바꿔 끼우므로 읽는 쪽은 항상 온전한 한 버전을 봅니다.
+    snapshot = (version, sheets, display_sheets, sheet_roles)
+    store["history"].append(snapshot)
+    store["current"] = snapshot
+    
+    unresolved = [role for role in SHEET_ROLES if role not in sheet_roles]
+    if unresolved:
+        print(f"⚠️ 엑셀에서 찾지 못한 시트 역할: {', '.join(unresolved)}")
+    store["source"] = (target_file, mtime)
+    return True
+
+def _excel_watch_loop(store):
+    while True:
+        time.sleep(EXCEL_POLL_SECONDS)
+        try:
+            with store["lock"]:
+                if _refresh_workbook(store):
+                    print(f"🔄 엑셀 새 버전 적용: {store['current'][0]}")
+        except Exception as e:
+            print(f"엑셀 백그라운드 갱신 실패 (이전 데이터 유지): {e}")
+
+@st.cache_resource
+def _get_workbook_store():
+    # 모든 세션이 함께 쓰는 저장소 (프로세스당 1개)
+    store = {"lock": threading.Lock(), "current": (None, {}, {}, {}), "source": None,
+             "history": deque(maxlen=SNAPSHOT_HISTORY)}
+    watcher = threading.Thread(target=_excel_watch_loop, args=(store,), daemon=True, name="excel-watcher")
+    watcher.start()
+    return store
+
+def load_excel():
+    store = _get_workbook_store()
+    
+    # 최초 1회만 직접 읽습니다 (서버 시작 직후). 동시에 들어온 세션은 lock에서 기다립니다.
+    if store["source"] is None:
+        with store["lock"]:
+            if store["source"] is None:
+                try:
+                    _refresh_workbook(store)
+                except Exception as e:
+                    st.error(f"엑셀 파일 로딩 실패: {e}")
+    
+    return store["current"][1] # 파일이 아예 없으면 빈 딕셔너리 반환
+
+def _find_snapshot(all_sheets):
+    # load_excel()이 돌려준 시트 딕셔너리와 같은 객체(is)인 스냅샷을 찾습니다.
+    store = _get_workbook_store()
+    current = store["current"]
+    if all_sheets is current[1]:
+        return current
+    for snapshot in reversed(list(store["history"])):
+        if all_sheets is snapshot[1]:
+            return snapshot
+    return None
+
+def get_excel_version(all_sheets):
+    """all_sheets(load_excel() 결과)의 엑셀 버전 (내용 해시). 버전별 캐시의 키로 사용합니다.
+
+    지금 저장소의 버전을 따로 읽으면, 그 사이 감시 스레드가 새 버전으로 바꿨을 때
+    이전 시트로 만든 색인이 새 버전 이름으로 캐시됩니다. 그래서 시트와 같이 찾습니다.
+    """
+    snapshot = _find_snapshot(all_sheets)
+    if snapshot is not None:
+        return snapshot[0]
+    return f"unversioned-{id(all_sheets)}" # load_excel()이 준 시트가 아닌 경우
+
+# --------------------------------------------------------------------------
+# [2-2] 화면용 시트 (아이콘 이름 -> 이모지, 엑셀 로딩 시 1번만)
+# --------------------------------------------------------------------------
+# 엑셀에 복사돼 들어온 구글 아이콘 이름(smart_toy 등)을 이모지로 바꿉니다.
+# 예전에는 get_sheet_data를 부를 때마다 시트 전체에 정규식 치환을 4번 했습니다.
+ICON_TOKENS = {
+    "keyboard_double_arrow_right": "▶",
+    "smart_toy": "🤖",
+    "check_circle": "✅",
+    "warning": "⚠️",
+}
+_ICON_PATTERN = re.compile("|".join(re.escape(token) for token in ICON_TOKENS))
+
+def _replace_icon_tokens(value):
+    if isinstance(value, str):
+        return _ICON_PATTERN.sub(lambda m: ICON_TOKENS[m.group(0)], value)
+    return value
+
+def normalize_icon_tokens(df):
+    """글자 열만 한 번에 치환합니다. 바뀐 열이 없으면 원본을 그대로 돌려줍니다."""
+    changed = {}
+    for column in df.columns:
+        values = df[column]
+        if not (values.dtype == object or pd.api.types.is_string_dtype(values)):
+            continue
+        if not values.map(lambda v: isinstance(v, str) and _ICON_PATTERN.search(v) is not None).any():
+            continue
+        changed[column] = values.map(_replace_icon_tokens)
+    
+    if not changed:
+        return df
+    normalized = df.copy()
+    for column, values in changed.items():
+        normalized[column] = values
+    return normalized
+
+def get_display_sheets(all_sheets):
+    # load_excel()이 준 시트라면 미리 치환해 둔 결과를 그대로 씁니다.
+    snapshot = _find_snapshot(all_sheets)
+    if snapshot is not None:
+        return snapshot[2]
+    return {name: normalize_icon_tokens(df) for name, df in all_sheets.items()}
+
+# --------------------------------------------------------------------------
+# [2-3] 시트 역할 -> 실제 시트 이름 (엑셀 로딩 시 1번만 찾아 둠)
+# --------------------------------------------------------------------------
+# 엑셀 시트 이름이 조금씩 달라도(예: '맛' / '맛체크') 화면 코드는 역할 이름으로 찾습니다.
+# 후보 이름을 앞에서부터 확인하고, 같은 이름이 없으면 이름에 포함된 시트를 씁니다.
+SHEET_ROLES = {
+    "products": ("제품설명",),
+    "safety": ("안전성",),
+    "activize": ("액티바이즈", "액티증상", "호전반응", "반응"),
+    "taste": ("맛", "맛체크", "맛반응"),
+    "guide": ("호전반응",),
+    "compensation": ("보상플랜",),
+    "videos": ("아침방송",),
+    "stories": ("체험사례",),
+    "success": ("성공사례",),
+    "qa": ("질의응답",),
+}
+
+def find_sheet_name(sheet_names, alias):
+    if alias in sheet_names:
+        return alias
+    return next((name for name in sheet_names if alias in name), None)
+
+def resolve_sheet_roles(sheet_names):
+    sheet_roles = {}
+    for role, aliases in SHEET_ROLES.items():
+        for alias in aliases:
+            sheet_name = find_sheet_name(sheet_names, alias)
+            if sheet_name is not None:
+                sheet_roles[role] = sheet_name
+                break
+    return sheet_roles
+
+def get_sheet_roles(all_sheets):
+    snapshot = _find_snapshot(all_sheets)
+    if snapshot is not None:
+        return snapshot[3]
+    return resolve_sheet_roles(list(all_sheets.keys()))
+
+def get_unresolved_sheet_roles(all_sheets):
+    """엑셀에서 찾지 못한 역할 [(역할, 후보 이름들), ...] (관리자 점검용)"""
+    sheet_roles = get_sheet_roles(all_sheets)
+    return [(role, ", ".join(aliases)) for role, aliases in SHEET_ROLES.items() if role not in sheet_roles]
 
 # --------------------------------------------------------------------------
 # [3] (구버전 호환용) AI 함수 더미
@@ -108,3 +512,16 @@ def load_excel():
 # 혹시 다른 파일에서 이 함수를 찾을까봐 남겨두는 안전 장치입니다.
 def generate_ai_response(prompt, api_key, model_name, all_sheets=None):
     return "AI 기능은 view_ai.py에서 직접 처리됩니다."
+
+
+# 이미지 변환본 + 엑셀 스냅샷 미리 만들기: python utils.py
+if __name__ == "__main__":
+    build_all_image_variants()
+    print(f"✅ 이미지 변환본 생성 완료: {IMAGE_CACHE_DIR}")
+
+    excel_file = find_excel_file()
+    if excel_file:
+        snapshot_version, _ = load_excel_snapshot(excel_file)
+        print(f"✅ 스냅샷 생성 완료: {_snapshot_path(excel_file, snapshot_version)}")
+    else:
+        print("❌ 엑셀 파일이 없습니다.")
@@ -1,24 +1,267 @@
 import streamlit as st
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions, retry
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
 from config import MAIN_CONTACT_NAME, MAIN_CONTACT_PHONE
+from config import AI_STREAM_RESPONSE, AI_CONTEXT_TOTAL_TOKENS, AI_CONTEXT_SHEET_TOKENS, AI_CONTEXT_DEFAULT_SHEET_TOKENS
+from config import AI_REQUEST_TIMEOUT, AI_RETRY_DEADLINE
+from config import AI_ANSWER_CACHE_TTL, AI_ANSWER_CACHE_MAX_ENTRIES, AI_ANSWER_CACHE_SIMILARITY
 from func import save_user_log
+from search import build_index, search, normalize_text, tokenize
+from utils import get_excel_version, get_sheet_roles
+
+# [0] Gemini 모델 재사용 (모델 이름별로 프로세스당 1개)
+# 예전에는 질문마다 genai.configure + GenerativeModel을 새로 만들었습니다.
+# 이제 한 번 만든 모델(내부 연결 포함)을 모든 세션이 같이 쓰고,
+# 응답이 없으면 AI_REQUEST_TIMEOUT 초 후 끊고, 일시적 오류는 간격을 늘려가며 재시도합니다.
+#
+# 주의: genai.configure는 프로세스 전체 설정이고, 모델은 처음 호출할 때 그 설정으로 연결을 만듭니다.
+# 그래서 키별로 모델을 따로 둘 수 없습니다. 이 앱은 secrets의 GOOGLE_API_KEY 하나만 쓰며,
+# 혹시 키가 바뀌면 설정을 다시 하고 만들어 둔 모델을 모두 버립니다 (이전 키 연결이 섞이지 않도록).
+_TRANSIENT_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+)
+
+_gemini_config = {"api_key": None, "lock": threading.Lock()}
+
+@st.cache_resource(show_spinner=False)
+def _get_gemini_model(model_name):
+    # 모델 이름에서 models/ 접두사 제거 (혹시 있을 경우)
+    return genai.GenerativeModel(model_name.replace("models/", ""))
+
+def get_gemini_model(api_key, model_name):
+    with _gemini_config["lock"]:
+        if api_key != _gemini_config["api_key"]:
+            genai.configure(api_key=api_key)
+            _get_gemini_model.clear()
+            _gemini_config["api_key"] = api_key
+    return _get_gemini_model(model_name)
+
+def _request_options():
+    return {
+        "timeout": AI_REQUEST_TIMEOUT,
+        "retry": retry.Retry(
+            predicate=retry.if_exception_type(*_TRANSIENT_ERRORS),
+            initial=1.0, multiplier=2.0, maximum=8.0,
+            timeout=AI_RETRY_DEADLINE,
+        ),
+    }
 
 # [1] API 호출 함수 (안전 모드)
-def get_safe_response(prompt, api_key, model_name):
+# status를 넘기면 답변이 끝까지 정상으로 만들어졌을 때만 status["complete"] = True 가 됩니다.
+# (오류 문구도 답변처럼 돌려주므로, 저장해도 되는 답변인지는 이 값으로 판단합니다.)
+def get_safe_response(prompt, api_key, model_name, status=None):
+    if status is None: status = {}
+    status["complete"] = False
     if not api_key:
         return "⚠️ API 키가 설정되지 않았습니다."
     
+    safe_model_name = model_name.replace("models/", "")
     try:
-        genai.configure(api_key=api_key)
-        # 모델 이름에서 models/ 접두사 제거 (혹시 있을 경우)
-        safe_model_name = model_name.replace("models/", "")
-        model = genai.GenerativeModel(safe_model_name)
-        response = model.generate_content(prompt)
-        return response.text
+        model = get_gemini_model(api_key, model_name)
+        response = model.generate_content(prompt, request_options=_request_options())
+        text = response.text
+        status["complete"] = True
+        return text
         
     except Exception as e:
         return f"⚠️ AI 연결 오류 발생: {str(e)}\n(모델: {safe_model_name})"
 
+# [1-1] 스트리밍 API 호출 (답변이 만들어지는 대로 조금씩 전달)
+def stream_safe_response(prompt, api_key, model_name, status=None):
+    if status is None: status = {}
+    status["complete"] = False
+    if not api_key:
+        yield "⚠️ API 키가 설정되지 않았습니다."
+        return
+    
+    safe_model_name = model_name.replace("models/", "")
+    try:
+        model = get_gemini_model(api_key, model_name)
+        for chunk in model.generate_content(prompt, stream=True, request_options=_request_options()):
+            try:
+                text = chunk.text
+            except ValueError:
+                continue # 안전 필터 등으로 글자가 없는 조각은 건너뜀
+            if text:
+                yield text
+        # 중간에 끊기면 여기까지 오지 않으므로 앞부분만 받은 답변은 '완료'가 아님
+        status["complete"] = True
+                
+    except Exception as e:
+        yield f"⚠️ AI 연결 오류 발생: {str(e)}\n(모델: {safe_model_name})"
+
+# [1-2] 엑셀 검색 색인 + 프롬프트용 텍스트 (엑셀 버전마다 1번만 생성)
+# 예전에는 질문마다 모든 시트의 앞부분(질의응답 100줄, 나머지 30줄)을 통째로 넣어서
+# 느리고 토큰도 많이 들고, 뒷부분 행은 아예 AI가 볼 수 없었습니다.
+# 이제 모든 시트의 모든 행을 색인하고 프롬프트용 문장으로 미리 바꿔 두었다가,
+# 질문과 관련된 행만 시트별 한도(config.py) 안에서 골라 넣습니다.
+RETRIEVAL_TOP_K = 25
+
+def approx_tokens(text):
+    # 한국어 기준 대략 2글자당 1토큰으로 계산 (정확한 값이 아닌 한도 관리용)
+    return (len(text) + 1) // 2
+
+def _row_to_text(row):
+    return " | ".join(f"{col}: {val}" for col, val in row.items() if normalize_text(val))
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def build_sheet_retriever(version, _all_sheets):
+    rows = []        # 문서번호 -> (시트이름, 프롬프트용 한 줄)
+    documents = []
+    sheet_stats = {} # 시트이름 -> 행 수 / 바이트 / 대략 토큰
+    for sheet_name, df in _all_sheets.items():
+        stats = {"rows": 0, "bytes": 0, "tokens": 0}
+        for _, row in df.iterrows():
+            row_text = _row_to_text(row)
+            if row_text:
+                rows.append((sheet_name, row_text))
+                documents.append(f"{sheet_name} {row_text}")
+                stats["rows"] += 1
+                stats["bytes"] += len(row_text.encode("utf-8"))
+                stats["tokens"] += approx_tokens(row_text)
+        sheet_stats[sheet_name] = stats
+    return {"rows": rows, "index": build_index(documents), "sheet_stats": sheet_stats}
+
+def get_context_stats(all_sheets):
+    # 관리자 화면용: 시트별로 프롬프트에 들어갈 수 있는 데이터 크기
+    if not all_sheets:
+        return {}
+    return build_sheet_retriever(get_excel_version(all_sheets), all_sheets)["sheet_stats"]
+
+def build_context_text(all_sheets, question, top_k=RETRIEVAL_TOP_K):
+    if not all_sheets:
+        return ""
+    retriever = build_sheet_retriever(get_excel_version(all_sheets), all_sheets)
+    # 시트별 한도는 역할 이름으로 적혀 있으므로 실제 시트 이름으로 바꿔 둠 (config.AI_CONTEXT_SHEET_TOKENS)
+    sheet_roles = get_sheet_roles(all_sheets)
+    sheet_budgets = {sheet_roles[role]: budget for role, budget in AI_CONTEXT_SHEET_TOKENS.items() if role in sheet_roles}
+    
+    # 관련도 높은 순서대로, 시트별/전체 한도를 넘지 않는 만큼만 모으기
+    matched = {}
+    used_total = 0
+    used_by_sheet = {}
+    for doc_id, _ in search(retriever["index"], question, top_k):
+        sheet_name, row_text = retriever["rows"][doc_id]
+        cost = approx_tokens(row_text)
+        sheet_budget = sheet_budgets.get(sheet_name, AI_CONTEXT_DEFAULT_SHEET_TOKENS)
+        if used_by_sheet.get(sheet_name, 0) + cost > sheet_budget: continue
+        if used_total + cost > AI_CONTEXT_TOTAL_TOKENS: continue
+        used_by_sheet[sheet_name] = used_by_sheet.get(sheet_name, 0) + cost
+        used_total += cost
+        matched.setdefault(sheet_name, []).append(row_text)
+    
+    context_text = ""
+    # 질의응답 시트 우선 처리 (시트 이름은 utils.SHEET_ROLES의 'qa' 역할로 찾음)
+    qa_sheet_name = sheet_roles.get("qa")
+    if qa_sheet_name in matched:
+        qa_text = "\n".join(matched[qa_sheet_name])
+        context_text += f"\n[🔥🔥 핵심 질의응답 데이터 (우선순위 높음)]\n{qa_text}\n"
+    
+    # 나머지 시트 처리
+    for sheet_name, row_texts in matched.items():
+        if sheet_name == qa_sheet_name: continue
+        summary = "\n".join(row_texts)
+        context_text += f"\n--- [{sheet_name} 데이터 (관련 항목)] ---\n{summary}\n"
+    return context_text
+
+# [1-3] 비슷한 질문 답변 캐시 (같은 연령대/성별/관심사 + 같은 엑셀 버전)
+# 변비, 당뇨, 가격 문의처럼 거의 같은 질문이 반복되므로, 질문 글자 조각이
+# 충분히 비슷하면(코사인 유사도) AI를 다시 부르지 않고 저장된 답변을 바로 보여줍니다.
+# 단, '먹어도 되나요' / '먹어도 안되나요'처럼 부정어만 다른 질문은 글자가 거의 같아도
+# 뜻이 반대이므로, 부정어(안/못/없/말) 개수가 다르면 재사용하지 않습니다.
+# 오래된 답변은 AI_ANSWER_CACHE_TTL 이후 버리고, 개수가 넘치면 가장 안 쓴 것부터 지웁니다.
+NEGATION_MARKERS = ("안", "못", "없", "말")
+@st.cache_resource
+def _get_answer_cache():
+    return {"entries": OrderedDict(), "lock": threading.Lock(), "hits": 0, "misses": 0}
+
+def _user_bucket(user_info):
+    try: age_group = f"{int(user_info.get('age', 0)) // 10 * 10}대"
+    except (TypeError, ValueError): age_group = "-"
+    conditions = ",".join(sorted(normalize_text(c) for c in user_info.get("conditions", [])))
+    return (age_group, user_info.get("gender", "-"), conditions)
+
+def _normalize_question(question):
+    return re.sub(r"[^\w\s]", "", normalize_text(question)).strip()
+
+def _question_key(normalized):
+    # 띄어쓰기만 다른 질문은 같은 질문으로 봅니다 ('몇 번' / '몇번')
+    return normalized.replace(" ", "")
+
+def _negation_signature(normalized):
+    return tuple(normalized.count(marker) for marker in NEGATION_MARKERS)
+
+def _cosine(a, b):
+    dot = sum(freq * b[gram] for gram, freq in a.items() if gram in b)
+    if not dot: return 0.0
+    norm_a = math.sqrt(sum(v * v for v in a.values()))
+    norm_b = math.sqrt(sum(v * v for v in b.values()))
+    return dot / (norm_a * norm_b)
+
+def find_cached_answer(question, user_info, all_sheets):
+    cache = _get_answer_cache()
+    group = (get_excel_version(all_sheets), _user_bucket(user_info))
+    normalized = _normalize_question(question)
+    question_key = _question_key(normalized)
+    negation = _negation_signature(question_key)
+    grams = Counter(tokenize(normalized))
+    now = time.time()
+    
+    with cache["lock"]:
+        best_key, best_score = None, 0.0
+        for key, entry in list(cache["entries"].items()):
+            if now - entry["created"] > AI_ANSWER_CACHE_TTL:
+                del cache["entries"][key]
+                continue
+            if key[0] != group: continue
+            if key[1] == question_key:
+                score = 1.0
+            elif entry["negation"] != negation:
+                continue # 부정어가 다르면 뜻이 다른 질문
+            else:
+                score = _cosine(grams, entry["grams"])
+            if score > best_score:
+                best_key, best_score = key, score
+        
+        if best_key is not None and best_score >= AI_ANSWER_CACHE_SIMILARITY:
+            cache["entries"].move_to_end(best_key) # 최근 사용 표시
+            cache["hits"] += 1
+            return cache["entries"][best_key]["answer"]
+        cache["misses"] += 1
+        return None
+
+def save_cached_answer(question, user_info, answer, all_sheets):
+    cache = _get_answer_cache()
+    normalized = _normalize_question(question)
+    question_key = _question_key(normalized)
+    key = ((get_excel_version(all_sheets), _user_bucket(user_info)), question_key)
+    with cache["lock"]:
+        cache["entries"][key] = {
+            "answer": answer, "grams": Counter(tokenize(normalized)),
+            "negation": _negation_signature(question_key), "created": time.time(),
+        }
+        cache["entries"].move_to_end(key)
+        while len(cache["entries"]) > AI_ANSWER_CACHE_MAX_ENTRIES:
+            cache["entries"].popitem(last=False)
+
+def get_answer_cache_stats():
+    cache = _get_answer_cache()
+    total = cache["hits"] + cache["misses"]
+    return {
+        "저장된 답변": len(cache["entries"]),
+        "재사용(히트)": cache["hits"],
+        "새로 생성(미스)": cache["misses"],
+        "히트율": f"{cache['hits'] / total:.0%}" if total else "-",
+    }
+
 # [2] 메인 화면 및 로직
 def render_ai_assistant(api_key, selected_model, all_sheets):
     st.markdown("<h2 style='text-align:center;'>🤖 PM AI 상담</h2>", unsafe_allow_html=True)
@@ -77,66 +320,66 @@ def render_ai_assistant(api_key, selected_model, all_sheets):
             st.markdown(prompt)
         
         with st.chat_message("assistant", avatar="🤖"):
-            with st.spinner("전문 데이터 분석 및 답변 작성 중..."):
-                
-                # ---------------------------------------------------------
-                # 1. 엑셀 데이터 컨텍스트화
-                # ---------------------------------------------------------
-                context_text = ""
-                
-                if all_sheets:
-                    # 질의응답 시트 우선 처리
-                    if "질의응답" in all_sheets:
-                        qa_df = all_sheets["질의응답"]
-                        qa_text = qa_df.astype(str).head(100).to_string(index=False)
-                        context_text += f"\n[🔥🔥 핵심 질의응답 데이터 (우선순위 높음)]\n{qa_text}\n"
-                    
-                    # 나머지 시트 처리
-                    for sheet_name, df in all_sheets.items():
-                        if sheet_name == "질의응답": continue
-                        summary = df.astype(str).head(30).to_string(index=False)
-                        context_text += f"\n--- [{sheet_name} 데이터] ---\n{summary}\n"
-
-                # ---------------------------------------------------------
-                # 2. 강력한 시스템 프롬프트 (인사 생략 + 전문성 강화)
-                # ---------------------------------------------------------
-                full_prompt = f"""
-                당신은 'PM 인터내셔널'의 최고위급 건강 컨설턴트입니다.
-                
-                [사용자 프로필]
-                - 연령/성별: {user_info['age']}세 {user_info['gender']}
-                - 관심사: {', '.join(user_info['conditions'])}
-
-                [답변 작성 절대 원칙]
-                1. **인사말 금지:** "안녕하세요", "반갑습니다" 같은 인사를 **절대** 하지 마세요. 질문에 대한 **결론부터 즉시** 답변하세요.
-                2. **전문성 및 구조화:** 답변은 전문가처럼 확신에 찬 어조로 작성하세요. 가독성을 위해 **글머리 기호(Bullets)**나 **볼드체**를 적극 사용하세요.
-                3. **데이터 활용:** - 제공된 [내부 데이터베이스]에 답이 있다면 그 수치와 근거를 정확히 인용하세요.
-                    - 데이터가 없다면, 당신이 가진 **일반적인 영양학/생리학/비즈니스 전문 지식**을 활용하여 최고 수준의 답변을 제공하세요. "데이터가 없습니다"라고 말하지 말고, 외부 지식으로 해결하세요.
-                4. **공감과 맞춤:** 사용자의 연령과 건강 관심사를 고려하여, 그들에게 실질적인 도움이 되는 조언을 덧붙이세요.
-
-                [내부 데이터베이스]
-                {context_text}
-
-                [사용자 질문]
-                {prompt}
-                """
+            # 비슷한 질문의 답변이 있으면 엑셀 검색 / 프롬프트 작성 없이 바로 보여줌
+            raw_response = find_cached_answer(prompt, user_info, all_sheets)
+            if raw_response is not None:
+                st.markdown(raw_response)
+            else:
+                with st.spinner("전문 데이터 분석 중..."):
                 
-                # AI 답변 생성
-                raw_response = get_safe_response(full_prompt, api_key, selected_model)
-                
-                # ---------------------------------------------------------
-                # 3. 문의처 강제 부착 (Python 레벨에서 처리)
-                # ---------------------------------------------------------
-                # AI가 생성한 답변 뒤에 무조건 연락처를 붙입니다.
-                footer_msg = f"\n\n---\n📞 **추가 문의 및 상담**: {MAIN_CONTACT_NAME} ({MAIN_CONTACT_PHONE})"
-                final_response = raw_response + footer_msg
-                
-                # 화면 출력
-                st.markdown(final_response)
-                
-                # 로그 저장 및 대화 기록 (한국 시간 함수 적용됨 - func.py에서)
-                try: save_user_log(user_info, prompt, final_response)
-                except: pass
+                    # ---------------------------------------------------------
+                    # 1. 엑셀 데이터 컨텍스트화 (질문 + 관심사와 관련된 행만 검색)
+                    # ---------------------------------------------------------
+                    search_query = f"{prompt} {' '.join(user_info['conditions'])}"
+                    context_text = build_context_text(all_sheets, search_query)
+
+                    # ---------------------------------------------------------
+                    # 2. 강력한 시스템 프롬프트 (인사 생략 + 전문성 강화)
+                    # ---------------------------------------------------------
+                    full_prompt = f"""
+                    당신은 'PM 인터내셔널'의 최고위급 건강 컨설턴트입니다.
                 
+                    [사용자 프로필]
+                    - 연령/성별: {user_info['age']}세 {user_info['gender']}
+                    - 관심사: {', '.join(user_info['conditions'])}
+
+                    [답변 작성 절대 원칙]
+                    1. **인사말 금지:** "안녕하세요", "반갑습니다" 같은 인사를 **절대** 하지 마세요. 질문에 대한 **결론부터 즉시** 답변하세요.
+                    2. **전문성 및 구조화:** 답변은 전문가처럼 확신에 찬 어조로 작성하세요. 가독성을 위해 **글머리 기호(Bullets)**나 **볼드체**를 적극 사용하세요.
+                    3. **데이터 활용:** - 제공된 [내부 데이터베이스]에 답이 있다면 그 수치와 근거를 정확히 인용하세요.
+                        - 데이터가 없다면, 당신이 가진 **일반적인 영양학/생리학/비즈니스 전문 지식**을 활용하여 최고 수준의 답변을 제공하세요. "데이터가 없습니다"라고 말하지 말고, 외부 지식으로 해결하세요.
+                    4. **공감과 맞춤:** 사용자의 연령과 건강 관심사를 고려하여, 그들에게 실질적인 도움이 되는 조언을 덧붙이세요.
+
+                    [내부 데이터베이스]
+                    {context_text}
+
+                    [사용자 질문]
+                    {prompt}
+                    """
+
+                # AI 답변 생성 (스트리밍 모드면 만들어지는 글자를 바로바로 화면에 표시)
+                response_status = {}
+                if AI_STREAM_RESPONSE:
+                    raw_response = st.write_stream(stream_safe_response(full_prompt, api_key, selected_model, response_status))
+                else:
+                    with st.spinner("답변 작성 중..."):
+                        raw_response = get_safe_response(full_prompt, api_key, selected_model, response_status)
+                    st.markdown(raw_response)
+                # 끝까지 정상으로 받은 답변만 저장 (오류 / 중간에 끊긴 답변은 저장하지 않음)
+                if raw_response and response_status.get("complete"):
+                    save_cached_answer(prompt, user_info, raw_response, all_sheets)
+            
+            # ---------------------------------------------------------
+            # 3. 문의처 강제 부착 (Python 레벨에서 처리)
+            # ---------------------------------------------------------
+            # AI가 생성한 답변 뒤에 무조건 연락처를 붙입니다.
+            footer_msg = f"\n\n---\n📞 **추가 문의 및 상담**: {MAIN_CONTACT_NAME} ({MAIN_CONTACT_PHONE})"
+            st.markdown(footer_msg)
+            final_response = raw_response + footer_msg
+            
+            # 로그 저장 및 대화 기록 (한국 시간 함수 적용됨 - func.py에서)
+            try: save_user_log(user_info, prompt, final_response)
+            except: pass
+            
         st.session_state.messages.append({"role": "assistant", "content": final_response})
 
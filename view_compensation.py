@@ -1,13 +1,14 @@
 import streamlit as st
 from utils import get_optimized_image
-from components import apply_custom_styles
+from components import apply_custom_styles, youtube_player
+from func import get_raw_sheet
 
 # 1. 보상플랜 핵심요약 (기존 유지)
 def render_compensation(all_sheets):
     apply_custom_styles()
     st.markdown("## 📚 보상플랜 핵심요약")
     
-    target_sheet = all_sheets.get('보상플랜') if all_sheets else None
+    target_sheet = get_raw_sheet(all_sheets, "compensation")
     if target_sheet is not None:
         df = target_sheet.fillna("")
         for index, row in df.iterrows():
@@ -16,11 +17,11 @@ def render_compensation(all_sheets):
             youtube_link = row.get('유튜브')
             with st.expander(f"💎 {title}", expanded=True):
                 st.write(content)
-                if youtube_link and str(youtube_link).startswith('http'): st.video(str(youtube_link))
+                if youtube_link and str(youtube_link).startswith('http'): youtube_player(youtube_link, key=f"comp_{index}")
                 img_list = []
                 for i in range(1, 5): 
                     if f"이미지{i}" in row and row[f"이미지{i}"]:
-                        img_path = get_optimized_image(row[f"이미지{i}"])
+                        img_path = get_optimized_image(row[f"이미지{i}"], width=1280)
                         if "flaticon" not in img_path: img_list.append(img_path)
                 if img_list:
                     cols = st.columns(len(img_list))
@@ -41,7 +42,11 @@ def render_calculator_v2():
         3. 실제소득은 **월 예상 수령액**보다 더 높은 수익을 받습니다.
         """)
     st.markdown("---")
-    
+    _render_simulator()
+
+# 입력칸을 바꾸면 아래 입력 ~ 결과 부분만 다시 계산/표시합니다 (페이지 전체 재실행 X)
+@st.fragment
+def _render_simulator():
     # ----------------------------------------------------------------------
     # [디자인 수정 포인트] 
     # 1. padding-right: 3rem -> +/- 버튼 너비만큼 글자를 왼쪽으로 밀어서 '흰 박스 중앙'에 맞춤
@@ -1,19 +1,72 @@
 # view_guide.py (호전반응 가이드)
 import streamlit as st
 from components import apply_custom_styles
+from search import build_index, search, normalize_text, decompose_hangul, get_choseong, is_choseong_query
+from utils import get_excel_version
+from func import get_raw_sheet
 
+# --------------------------------------------------------------------------
+# [0] 증상 검색 색인 (엑셀 버전별로 1번만 생성)
+# --------------------------------------------------------------------------
+# 예전에는 검색할 때마다 모든 행/칸을 글자로 바꿔 하나씩 비교했습니다.
+# 이제 행별 검색용 글자(일반 / 자모 / 초성)를 미리 만들어 두고 그 안에서만 찾습니다.
+GUIDE_SYMPTOM_COLUMN = '증상'
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def build_guide_index(version, _target_sheet):
+    df = _target_sheet.fillna("")
+    rows = df.to_dict("records")
+    texts = [normalize_text(" ".join(str(value) for value in row.values())) for row in rows]
+    symptoms = [str(row.get(GUIDE_SYMPTOM_COLUMN, "")) for row in rows]
+    return {
+        "rows": rows,
+        "index": build_index(texts),
+        "jamo": [decompose_hangul(text) for text in texts],
+        "choseong": [get_choseong(text) for text in texts],
+        "symptom_jamo": [decompose_hangul(symptom) for symptom in symptoms],
+        "symptom_choseong": [get_choseong(symptom) for symptom in symptoms],
+    }
+
+def search_guide(guide_index, query):
+    """(행 번호 리스트, 비슷한 결과 여부)를 돌려줍니다. 증상 이름에 들어 있는 행이 먼저 나옵니다."""
+    if not query.strip():
+        return list(range(len(guide_index["rows"]))), False
+
+    # 초성만 입력했으면 초성끼리, 아니면 자모끼리 비교 (입력 중인 글자도 찾기 위해)
+    if is_choseong_query(query):
+        needle, texts, symptoms = get_choseong(query), guide_index["choseong"], guide_index["symptom_choseong"]
+    else:
+        needle, texts, symptoms = decompose_hangul(query), guide_index["jamo"], guide_index["symptom_jamo"]
+
+    scores = dict(search(guide_index["index"], query, top_k=0))
+    hits = [i for i, text in enumerate(texts) if needle in text]
+    if hits:
+        hits.sort(key=lambda i: (needle not in symptoms[i], -scores.get(i, 0)))
+        return hits, False
+
+    # 그대로 들어 있는 행이 없으면 글자 조각이 많이 겹치는 순서로 추천
+    return [i for i, _ in search(guide_index["index"], query, top_k=5)], True
+
+# --------------------------------------------------------------------------
+# [1] 가이드 화면
+# --------------------------------------------------------------------------
 def render_guide(all_sheets):
     apply_custom_styles()
     st.markdown("## 💡 호전반응(명현현상) 가이드")
     st.info("몸이 좋아지는 과정에서 나타나는 일시적인 반응입니다.")
-    
-    target_sheet = all_sheets.get('호전반응') if all_sheets else None
+
+    target_sheet = get_raw_sheet(all_sheets, "guide")
     if target_sheet is not None:
-        search_query = st.text_input("🔍 증상을 검색해보세요", "")
-        df = target_sheet.fillna("")
-        if search_query: df = df[df.apply(lambda row: row.astype(str).str.contains(search_query, case=False).any(), axis=1)]
-        
-        for _, row in df.iterrows():
+        search_query = st.text_input("🔍 증상을 검색해보세요", "", placeholder="예: 두통, ㄷㅌ")
+        guide_index = build_guide_index(get_excel_version(all_sheets), target_sheet)
+        row_ids, is_similar = search_guide(guide_index, search_query)
+        if search_query.strip():
+            if is_similar and row_ids: st.caption("정확히 일치하는 증상이 없어 비슷한 증상을 보여드려요.")
+            elif row_ids: st.caption(f"검색 결과 {len(row_ids)}건")
+            else: st.info("검색 결과가 없습니다.")
+
+        for row_id in row_ids:
+            row = guide_index["rows"][row_id]
             with st.expander(f"📌 {row.get('증상', '증상명')}", expanded=False):
                 st.write(f"**👀 현상:** {row.get('나타나는현상','-')}")
                 st.info(f"**❓ 원인:** {row.get('발생원인','-')}")
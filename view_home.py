@@ -1,17 +1,24 @@
 import streamlit as st
 import random
 import os
+import math
+import time
 import pandas as pd 
-from utils import get_optimized_image
-from func import get_sheet_data, get_daily_visitor_count 
+from utils import get_optimized_image, get_image_miss_stats, get_unresolved_sheet_roles, load_excel
+from func import get_sheet_data, get_raw_sheet, get_daily_visitor_count 
 from config import FAMILY_IDS 
+from components import youtube_player
+from view_videos import get_latest_broadcast, format_broadcast_date
 
 # --------------------------------------------------------------------------
 # [1] 관리자용 로그 확인 함수
 # --------------------------------------------------------------------------
+ADMIN_LOG_PAGE_SIZE = 50
+
 def render_admin_logs():
     import pandas as pd
-    from func import get_google_sheet_connection 
+    from func import get_page_view_counts, sync_admin_logs, reset_admin_logs
+    from func import count_admin_logs, query_admin_logs, export_admin_logs_csv
 
     st.markdown("---")
     with st.expander("🔐 관리자 전용: AI 상담 이력 보기 (구글 연동)"):
@@ -19,37 +26,87 @@ def render_admin_logs():
         ADMIN_PASSWORD = "1234"
         
         if password == ADMIN_PASSWORD:
-            st.success("✅ 관리자 인증 완료! (구글 시트 로딩 중...)")
+            st.success("✅ 관리자 인증 완료!")
             
             try:
-                client = get_google_sheet_connection()
-                if client:
-                    sheet = client.open("PM_AI_상담이력").sheet1
-                    data = sheet.get_all_records() 
-                    
-                    if data:
-                        df = pd.DataFrame(data)
-                        if "날짜시간" in df.columns:
-                            df = df.sort_values(by="날짜시간", ascending=False)
-                            
-                        st.write(f"📊 총 **{len(df)}건**의 영구 저장된 기록이 있습니다.")
-                        st.dataframe(df, use_container_width=True)
-                        
-                        csv_data = df.to_csv(index=False).encode('utf-8-sig')
-                        st.download_button(
-                            label="📥 엑셀 파일로 다운로드",
-                            data=csv_data,
-                            file_name="PM_상담_이력_구글연동.csv",
-                            mime="text/csv"
-                        )
+                # 1. 새 기록만 가져오기 (1분에 한 번 자동, 또는 버튼)
+                b1, b2 = st.columns(2)
+                refresh = b1.button("🔄 새 기록 불러오기", use_container_width=True)
+                full_reload = b2.button("♻️ 전체 다시 불러오기", use_container_width=True)
+                if full_reload:
+                    reset_admin_logs()
+                if refresh or full_reload or time.time() - st.session_state.get("admin_logs_synced_at", 0) > 60:
+                    new_count = sync_admin_logs()
+                    if new_count is None:
+                        st.error("구글 시트 연결에 실패했습니다. (저장된 사본을 보여드립니다)")
                     else:
-                        st.info("데이터는 연결되었으나, 아직 기록된 내용이 없습니다.")
+                        st.session_state.admin_logs_synced_at = time.time()
+                        if new_count: st.toast(f"새 기록 {new_count}건을 가져왔습니다.")
+                
+                # 2. 검색 조건
+                f1, f2, f3, f4 = st.columns(4)
+                date_range = f1.date_input("기간", value=(), key="admin_log_dates")
+                age_group = f2.selectbox("연령대", ["전체"] + [f"{age}대" for age in range(10, 100, 10)], key="admin_log_age")
+                gender = f3.selectbox("성별", ["전체", "여성", "남성"], key="admin_log_gender")
+                condition = f4.text_input("건강상태", placeholder="예: 당뇨", key="admin_log_condition")
+                
+                filters = {
+                    "date_from": str(date_range[0]) if len(date_range) > 0 else None,
+                    "date_to": str(date_range[-1]) if len(date_range) > 0 else None,
+                    "age_group": age_group[:-1] if age_group != "전체" else None,
+                    "gender": gender if gender != "전체" else None,
+                    "condition": condition.strip() or None,
+                }
+                
+                # 3. 페이지 단위로 보여주기
+                total = count_admin_logs(filters)
+                if total:
+                    page_count = max(1, math.ceil(total / ADMIN_LOG_PAGE_SIZE))
+                    st.write(f"📊 총 **{total}건**의 영구 저장된 기록이 있습니다.")
+                    page = st.number_input(f"페이지 (전체 {page_count}쪽)", min_value=1, max_value=page_count, value=1, key="admin_log_page")
+                    df = query_admin_logs(filters, ADMIN_LOG_PAGE_SIZE, (page - 1) * ADMIN_LOG_PAGE_SIZE)
+                    st.dataframe(df, use_container_width=True)
+                    
+                    # 다운로드 버튼을 누를 때만 파일을 만듭니다.
+                    st.download_button(
+                        label="📥 엑셀 파일로 다운로드",
+                        data=lambda: export_admin_logs_csv(filters),
+                        file_name="PM_상담_이력_구글연동.csv",
+                        mime="text/csv"
+                    )
                 else:
-                    st.error("구글 시트 연결에 실패했습니다.")
+                    st.info("조건에 맞는 기록이 없습니다.")
                     
             except Exception as e:
                 st.error(f"데이터 로딩 중 오류 발생: {e}")
-                
+
+            # 엑셀 '이미지주소'에 적혀 있지만 폴더에 없는 이미지 목록
+            missing_images = get_image_miss_stats()
+            if missing_images:
+                st.warning(f"🖼️ 찾지 못한 이미지 {len(missing_images)}개 (엑셀 이미지 주소를 확인하세요)")
+                st.dataframe(pd.DataFrame(missing_images, columns=["파일명", "조회횟수"]), use_container_width=True)
+
+            # 엑셀에서 찾지 못한 시트 역할 (시트 이름이 바뀌었는지 확인)
+            unresolved_roles = get_unresolved_sheet_roles(load_excel())
+            if unresolved_roles:
+                st.warning(f"📑 찾지 못한 시트 {len(unresolved_roles)}개 (엑셀 시트 이름을 확인하세요)")
+                st.dataframe(pd.DataFrame(unresolved_roles, columns=["역할", "시트 이름 후보"]), use_container_width=True, hide_index=True)
+
+            # 오늘 페이지별 조회수 (로컬 기록)
+            page_views = get_page_view_counts()
+            if page_views:
+                st.caption("📈 오늘 페이지별 조회수")
+                st.dataframe(pd.DataFrame(list(page_views.items()), columns=["페이지", "조회수"]), use_container_width=True, hide_index=True)
+
+            # AI 상담 프롬프트에 들어갈 수 있는 시트별 데이터 크기 (한도 조정은 config.py)
+            from view_ai import get_context_stats, get_answer_cache_stats
+            st.caption("💬 AI 답변 재사용 현황")
+            st.dataframe(pd.DataFrame([get_answer_cache_stats()]), use_container_width=True, hide_index=True)
+            context_stats = get_context_stats(load_excel())
+            if context_stats:
+                st.caption("🤖 AI 상담 데이터 크기 (시트별)")
+                st.dataframe(pd.DataFrame.from_dict(context_stats, orient="index"), use_container_width=True)
+
         elif password:
             st.error("⛔ 비밀번호가 틀렸습니다.")
 
@@ -152,21 +209,19 @@ def render_home_dashboard(all_sheets):
     # 영상은 '더보기' 버튼을 눌러야 이동하는 것이 자연스러우므로 버튼 방식을 유지합니다.
     st.markdown('<div class="section-title">📺 오늘의 아침 조회</div>', unsafe_allow_html=True)
 
-    if all_sheets and "아침방송" in all_sheets:
-        video_df = all_sheets["아침방송"]
+    if get_raw_sheet(all_sheets, "videos") is not None:
+        # 정렬/최신 영상은 엑셀 버전별로 1번만 계산 (view_videos.build_broadcast_index)
+        latest_video = get_latest_broadcast(all_sheets)
         
-        if not video_df.empty:
+        if latest_video is not None:
             try:
-                video_df = video_df.sort_values(by="날짜", ascending=False)
-                latest_video = video_df.iloc[0] 
-                
                 v_link = str(latest_video.get("링크", "")).strip()
                 v_title = latest_video.get("설명", "제목 없음")
-                v_date = latest_video.get("날짜", "")
+                v_date = format_broadcast_date(latest_video)
 
                 with st.container(border=True):
                     if "http" in v_link:
-                        st.video(v_link)
+                        youtube_player(v_link, key="home_latest")
                     else:
                         st.error("영상 링크가 올바르지 않습니다.")
                     
@@ -193,7 +248,7 @@ def render_home_dashboard(all_sheets):
     # [5] 제품 안전성 인증 (이미지 클릭 링크 복구)
     st.markdown('<div class="section-title">제품 안전성 인증</div>', unsafe_allow_html=True)
     
-    target_safe = get_sheet_data(all_sheets, "안전성")
+    target_safe = get_sheet_data(all_sheets, "safety")
     safe_data = []
     
     if target_safe is not None:
@@ -211,7 +266,7 @@ def render_home_dashboard(all_sheets):
     for i, item in enumerate(safe_data):
         if i < 3:
             with s_cols[i]:
-                img_src = get_optimized_image(item.get('이미지', ''))
+                img_src = get_optimized_image(item.get('이미지', ''), width=320)
                 if "home_logo" in img_src or not img_src:
                       img_src = "https://cdn-icons-png.flaticon.com/512/1156/1156743.png"
 
@@ -228,13 +283,13 @@ def render_home_dashboard(all_sheets):
     # [6] FitLine 인기 제품 (이미지 클릭 링크 복구)
     st.markdown('<div class="section-title">FitLine 인기 제품</div>', unsafe_allow_html=True)
     
-    target_prod = get_sheet_data(all_sheets, "제품설명")
+    target_prod = get_sheet_data(all_sheets, "products")
     if target_prod is not None:
         df = target_prod.fillna("").head(4) 
         p_cols = st.columns(2)
         for i, (idx, item) in enumerate(df.iterrows()):
             with p_cols[i % 2]:
-                img_src = get_optimized_image(item.get('이미지주소', ''))
+                img_src = get_optimized_image(item.get('이미지주소', ''), width=640)
                 # 예전처럼 <a href> 태그를 사용하여 이미지를 클릭하면 이동하도록 수정
                 st.markdown(f"""
                     <a href="?page=제품구매" target="_self" class="card-link">
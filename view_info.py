@@ -132,6 +132,10 @@ def render_compensation(all_sheets):
 # ----------------------------------------------------------------
 # [보조 함수] 숫자 조절 버튼 (비율 최적화 & 넘침 방지)
 # ----------------------------------------------------------------
+# 버튼 콜백에서 값만 바꿉니다 (st.rerun()은 페이지 전체를 다시 실행하므로 쓰지 않음)
+def _step_counter(key, step, min_val, max_val):
+    st.session_state[key] = min(max(st.session_state[key] + step, min_val), max_val)
+
 def number_counter(label, key, default_val, min_val, max_val, unit=""):
     if key not in st.session_state:
         st.session_state[key] = default_val
@@ -143,10 +147,8 @@ def number_counter(label, key, default_val, min_val, max_val, unit=""):
     c_minus, c_val, c_plus = st.columns([1, 2, 1])
     
     with c_minus:
-        if st.button("－", key=f"dec_{key}", use_container_width=True):
-            if st.session_state[key] > min_val:
-                st.session_state[key] -= 1
-                st.rerun()
+        st.button("－", key=f"dec_{key}", use_container_width=True,
+                  on_click=_step_counter, args=(key, -1, min_val, max_val))
                 
     with c_val:
         st.markdown(f"""
@@ -156,10 +158,8 @@ def number_counter(label, key, default_val, min_val, max_val, unit=""):
         """, unsafe_allow_html=True)
         
     with c_plus:
-        if st.button("＋", key=f"inc_{key}", type="primary", use_container_width=True):
-            if st.session_state[key] < max_val:
-                st.session_state[key] += 1
-                st.rerun()
+        st.button("＋", key=f"inc_{key}", type="primary", use_container_width=True,
+                  on_click=_step_counter, args=(key, 1, min_val, max_val))
 
     if unit:
         st.markdown(f"<div style='text-align:center; font-size:12px; color:#888; margin-top:5px;'>{unit}</div>", unsafe_allow_html=True)
@@ -181,7 +181,11 @@ def render_calculator_v2():
         """)
 
     st.markdown("---")
+    _render_calculator_body()
 
+# +/- 버튼을 누르면 아래 입력 ~ 결과 부분만 다시 계산/표시합니다 (페이지 전체 재실행 X)
+@st.fragment
+def _render_calculator_body():
     # --- 입력 컨트롤 ---
     # 여기서 st.columns(3)을 쓰면 웹에서는 3단, 모바일에서는 자동으로 1단(세로)으로 바뀝니다.
     # 이전 코드의 nowrap 강제를 삭제했으므로 모바일 화면 밖으로 안 나갑니다.
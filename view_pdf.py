@@ -1,8 +1,173 @@
 import streamlit as st
 import os
-import base64
+import glob
+import multiprocessing
+import pickle
+import re
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pdf_render import render_page_to_file
+from search import build_index, normalize_text, search
+from utils import get_file_hash
 # func 임포트 제거됨 (render_return_home_button 안씀)
 
+# --------------------------------------------------------------------------
+# [0] PDF 페이지 이미지 캐시 (파일 해시 + 페이지 + 해상도별로 1번만 변환)
+# --------------------------------------------------------------------------
+# 예전에는 자료실을 열 때마다 모든 페이지를 150dpi로 변환했습니다.
+# 이제 지금 보는 페이지만 변환하고, 변환한 이미지는 .cache/pdf_pages 에 저장해 재사용합니다.
+PDF_CACHE_DIR = os.path.join(".cache", "pdf_pages")
+PDF_PREVIEW_DPI = 72    # 저해상도 (모바일 / 고화질 준비 전 미리보기)
+PDF_DPI = 150           # 고해상도 (데스크톱)
+PDF_RENDER_DPIS = (PDF_PREVIEW_DPI, PDF_DPI)
+
+def _page_image_path(file_path, page_index, dpi):
+    return os.path.join(PDF_CACHE_DIR, f"{get_file_hash(file_path)}_p{page_index + 1}_{dpi}.jpg")
+
+@st.cache_data(show_spinner=False)
+def _count_pdf_pages(file_path, file_hash):
+    import fitz  # pymupdf
+    with fitz.open(file_path) as doc:
+        return doc.page_count
+
+def get_pdf_page_count(file_path):
+    return _count_pdf_pages(file_path, get_file_hash(file_path))
+
+def render_pdf_page(file_path, page_index, dpi=PDF_DPI):
+    """페이지 1장을 JPEG로 변환해 캐시 경로를 돌려줍니다. 이미 있으면 바로 돌려줍니다."""
+    page_path = _page_image_path(file_path, page_index, dpi)
+    if not os.path.exists(page_path):
+        render_page_to_file(file_path, page_index, dpi, page_path)
+    return page_path
+
+# --------------------------------------------------------------------------
+# [0-1] 백그라운드 미리 변환 (서버 시작 시 모든 PDF, 모든 페이지, 두 가지 해상도)
+# --------------------------------------------------------------------------
+# PDF 변환은 CPU를 많이 쓰므로 스레드가 아닌 별도 프로세스에서 돌립니다.
+# 배포 후 첫 방문자도 이미 만들어진 페이지 이미지를 바로 보게 됩니다.
+# 컨테이너에서는 os.cpu_count()가 서버 전체 CPU 수라서 쓰지 않고 개수를 고정합니다.
+# (프로세스마다 메모리를 따로 쓰므로 1~2개면 충분합니다.)
+PDF_RENDER_WORKERS = 1
+
+@st.cache_resource
+def _get_pdf_render_pool():
+    pool = ProcessPoolExecutor(max_workers=PDF_RENDER_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return {"pool": pool, "pending": {}, "lock": threading.RLock()}
+
+def submit_pdf_page(file_path, page_index, dpi):
+    """백그라운드 변환을 예약하고 Future를 돌려줍니다. 이미 있으면 None."""
+    page_path = _page_image_path(file_path, page_index, dpi)
+    if os.path.exists(page_path):
+        return None
+    
+    render_pool = _get_pdf_render_pool()
+    with render_pool["lock"]:
+        future = render_pool["pending"].get(page_path)
+        if future is None:
+            future = render_pool["pool"].submit(render_page_to_file, file_path, page_index, dpi, page_path)
+            render_pool["pending"][page_path] = future
+            future.add_done_callback(lambda _: _forget_pending(render_pool, page_path))
+        return future
+
+def _forget_pending(render_pool, page_path):
+    with render_pool["lock"]:
+        render_pool["pending"].pop(page_path, None)
+
+def list_pdf_files():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return sorted(glob.glob(os.path.join(current_dir, "*.pdf")))
+
+def prerender_all_pdfs():
+    for file_path in list_pdf_files():
+        try:
+            page_count = get_pdf_page_count(file_path)
+            build_pdf_text_index(file_path)
+            # 전체 페이지 저해상도를 먼저, 그다음 고해상도
+            for dpi in PDF_RENDER_DPIS:
+                for page_index in range(page_count):
+                    submit_pdf_page(file_path, page_index, dpi)
+        except Exception as e:
+            print(f"PDF 미리 변환 실패 ({file_path}): {e}")
+
+@st.cache_resource
+def start_pdf_prerender():
+    # 서버(프로세스)당 한 번만 실행
+    worker = threading.Thread(target=prerender_all_pdfs, daemon=True, name="pdf-prerender")
+    worker.start()
+    return worker
+
+# --------------------------------------------------------------------------
+# [0-2] 본문 검색 색인 (PDF 파일 해시별로 1번만 만들어 .cache/pdf_text 에 저장)
+# --------------------------------------------------------------------------
+PDF_TEXT_DIR = os.path.join(".cache", "pdf_text")
+PDF_SEARCH_TOP_K = 10
+PDF_SNIPPET_CHARS = 60
+
+def build_pdf_text_index(file_path):
+    """페이지별 본문을 뽑아 검색 색인을 만들고 디스크에 저장합니다. 이미 있으면 읽어옵니다."""
+    index_path = os.path.join(PDF_TEXT_DIR, f"{get_file_hash(file_path)}.pkl")
+    if os.path.exists(index_path):
+        try:
+            with open(index_path, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            pass # 깨진 파일이면 새로 만듦
+
+    import fitz  # pymupdf
+    with fitz.open(file_path) as doc:
+        texts = [normalize_text(page.get_text()) for page in doc]
+    text_index = {"texts": texts, "index": build_index(texts)}
+
+    os.makedirs(PDF_TEXT_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=PDF_TEXT_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        pickle.dump(text_index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, index_path)
+    return text_index
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _load_pdf_text_index(file_path, file_hash):
+    return build_pdf_text_index(file_path)
+
+def _make_snippet(text, query):
+    # 검색어(단어)가 처음 나오는 곳 주변만 잘라서 보여줌
+    position = -1
+    for word in re.findall(r"\w+", normalize_text(query)):
+        position = text.find(word)
+        if position >= 0:
+            break
+    start = max(position - PDF_SNIPPET_CHARS // 2, 0) if position >= 0 else 0
+    snippet = text[start:start + PDF_SNIPPET_CHARS]
+    return ("…" if start else "") + snippet + ("…" if start + PDF_SNIPPET_CHARS < len(text) else "")
+
+def search_pdf_pages(file_path, query, top_k=PDF_SEARCH_TOP_K):
+    """[(페이지번호(0부터), 미리보기 문장), ...]를 관련도 순으로 돌려줍니다."""
+    text_index = _load_pdf_text_index(file_path, get_file_hash(file_path))
+    # 글자 조각 점수는 '제품', '사용'처럼 흔한 조각 하나만 겹쳐도 0보다 커지므로,
+    # 검색어의 모든 단어가 실제로 들어 있는 페이지만 결과로 보여줍니다. (순서는 점수순)
+    # 후보는 색인이 아닌 페이지 본문에서 찾습니다. 한 글자 검색어('물', '간')는
+    # 색인에 조각이 없어서 '물을', '간수치'가 있는 페이지를 점수로는 찾지 못하기 때문입니다.
+    words = re.findall(r"\w+", normalize_text(query))
+    scores = dict(search(text_index["index"], query, top_k=0))
+    hits = [page_index for page_index, text in enumerate(text_index["texts"]) if all(word in text for word in words)]
+    hits.sort(key=lambda page_index: -scores.get(page_index, 0))
+    return [(page_index, _make_snippet(text_index["texts"][page_index], query)) for page_index in hits[:top_k]]
+
+def _jump_to_page(page_key, page_number):
+    st.session_state[page_key] = page_number
+
+def _step_page(page_key, step):
+    # 버튼을 그리기 전에 바뀌어야 이전/다음 버튼의 비활성 상태가 새 페이지 기준으로 계산됨
+    st.session_state[page_key] += step
+
+def _read_file_bytes(file_path):
+    with open(file_path, "rb") as f:
+        return f.read()
+
+# --------------------------------------------------------------------------
+# [1] 자료실 화면 (한 페이지씩 보기)
+# --------------------------------------------------------------------------
 def render_pdf_viewer(file_name):
     # 홈 버튼 제거됨
     st.markdown("<h2 style='text-align:center;'>📄 BA 자료실</h2>", unsafe_allow_html=True)
@@ -11,12 +176,10 @@ def render_pdf_viewer(file_name):
     file_path = os.path.join(current_dir, file_name)
 
     if os.path.exists(file_path):
-        with open(file_path, "rb") as f:
-            base64_pdf = base64.b64encode(f.read()).decode('utf-8')
-            
+        # 다운로드 버튼을 누를 때만 원본 파일을 읽어서 그대로 전달
         st.download_button(
             label="📥 PDF 파일 다운로드 받기",
-            data=base64.b64decode(base64_pdf),
+            data=lambda: _read_file_bytes(file_path),
             file_name=file_name,
             mime="application/pdf",
             use_container_width=True
@@ -26,11 +189,57 @@ def render_pdf_viewer(file_name):
         st.markdown("---")
         
         try:
-            import fitz  # pymupdf
-            doc = fitz.open(file_path)
-            for page in doc:
-                pix = page.get_pixmap(dpi=150)
-                st.image(pix.tobytes(), use_container_width=True)
+            page_count = get_pdf_page_count(file_path)
+            page_key = f"pdf_page_{file_name}"
+            if page_key not in st.session_state:
+                st.session_state[page_key] = 1
+            
+            # 본문 검색 -> 찾은 페이지로 바로 이동
+            query = st.text_input(
+                "🔍 자료 검색", key=f"pdf_search_{file_name}",
+                placeholder="예: 액티바이즈, 섭취 방법"
+            )
+            if query.strip():
+                results = search_pdf_pages(file_path, query)
+                if results:
+                    st.caption(f"'{query}' 검색 결과 {len(results)}쪽")
+                    for page_index, snippet in results:
+                        st.button(
+                            f"{page_index + 1}쪽 · {snippet}", key=f"pdf_hit_{file_name}_{page_index}",
+                            on_click=_jump_to_page, args=(page_key, page_index + 1),
+                            use_container_width=True
+                        )
+                else:
+                    st.info("검색 결과가 없습니다.")
+            
+            # 페이지 이동 (이전 / 번호 / 다음)
+            c1, c2, c3 = st.columns([1, 2, 1])
+            with c1:
+                st.button(
+                    "◀ 이전", use_container_width=True, disabled=st.session_state[page_key] <= 1,
+                    on_click=_step_page, args=(page_key, -1)
+                )
+            with c3:
+                st.button(
+                    "다음 ▶", use_container_width=True, disabled=st.session_state[page_key] >= page_count,
+                    on_click=_step_page, args=(page_key, 1)
+                )
+            with c2:
+                st.number_input(
+                    f"페이지 (전체 {page_count}쪽)", min_value=1, max_value=max(page_count, 1),
+                    key=page_key, label_visibility="collapsed"
+                )
+            st.caption(f"📖 {st.session_state[page_key]} / {page_count} 쪽")
+            
+            if page_count:
+                page_index = st.session_state[page_key] - 1
+                page_slot = st.empty()
+                # 고화질이 아직 없으면: 미리 만들어 둔 저해상도를 먼저 보여주고,
+                # 고화질은 백그라운드 순서를 기다리지 않고 이 자리에서 바로 변환해 바꿔 끼움
+                preview_path = _page_image_path(file_path, page_index, PDF_PREVIEW_DPI)
+                if not os.path.exists(_page_image_path(file_path, page_index, PDF_DPI)) and os.path.exists(preview_path):
+                    page_slot.image(preview_path, use_container_width=True)
+                page_slot.image(render_pdf_page(file_path, page_index), use_container_width=True)
                 
         except ImportError:
              st.error("pymupdf 라이브러리가 필요합니다.")
@@ -11,7 +11,7 @@ from components import apply_custom_styles
 def render_products(all_sheets):
     st.markdown("<h2 style='text-align:center;'>📦 FitLine 제품</h2>", unsafe_allow_html=True)
     
-    target = get_sheet_data(all_sheets, "제품설명")
+    target = get_sheet_data(all_sheets, "products")
     
     if target is not None:
         df = target.fillna("")
@@ -20,7 +20,7 @@ def render_products(all_sheets):
             with cols[idx%2]:
                 with st.container():
                     img = row.get('이미지주소')
-                    img_src = get_optimized_image(img)
+                    img_src = get_optimized_image(img, width=320)
                     
                     # 한줄소개 줄바꿈 처리
                     raw_desc = str(row.get('한줄소개','-'))
@@ -56,7 +56,7 @@ def render_safety(all_sheets):
     </div>
     """, unsafe_allow_html=True)
 
-    target = get_sheet_data(all_sheets, "안전성")
+    target = get_sheet_data(all_sheets, "safety")
     if target is not None:
         df = target.fillna("")
         if "순서" in df.columns: df = df.sort_values(by="순서")
@@ -68,7 +68,7 @@ def render_safety(all_sheets):
             
             with c1:
                 img = row.get('이미지')
-                img_src = get_optimized_image(img)
+                img_src = get_optimized_image(img, width=320)
                 
                 st.markdown(f"""
                     <div style="display:flex; justify-content:center; align-items:center; height:100%;">
@@ -95,6 +95,85 @@ def render_safety(all_sheets):
 # --------------------------------------------------------------------------
 # 3. 액티바이즈 진단 (수정 완료: 대표 이미지 1개 + 상세 리스트 하단 배치)
 # --------------------------------------------------------------------------
+# 부위 선택(알약)을 누르면 이 부분만 다시 그립니다 (페이지 전체 재실행 X)
+@st.fragment
+def _render_part_reactions(df, part_col):
+    parts = df[part_col].unique().tolist()
+
+    st.write("### 👇 부위를 선택하세요")
+
+    # 메뉴바(알약) 스타일
+    try:
+        selected_part = st.pills(
+            label="부위 선택",
+            options=parts,
+            default=parts[0] if parts else None,
+            selection_mode="single",
+            label_visibility="collapsed"
+        )
+    except AttributeError:
+        selected_part = st.radio(
+            "부위 선택",
+            options=parts,
+            horizontal=True,
+            label_visibility="collapsed"
+        )
+
+    st.markdown("---")
+
+    if selected_part:
+        filtered_df = df[df[part_col] == selected_part]
+
+        if not filtered_df.empty:
+            # [핵심 수정 1] 대표 이미지 출력 (첫 번째 행의 이미지 사용)
+            first_row = filtered_df.iloc[0]
+            rep_image = first_row.get('이미지')
+
+            if rep_image and str(rep_image).strip() != "":
+                # 이미지를 중앙에 적당한 크기로 배치
+                c_img1, c_img2, c_img3 = st.columns([1, 2, 1])
+                with c_img2:
+                    st.image(get_optimized_image(rep_image, width=640), use_container_width=True)
+
+            st.markdown(f"### 📍 {selected_part} 상세 분석")
+
+            # [핵심 수정 2] 텍스트 리스트 출력
+            for idx, row in filtered_df.iterrows():
+                # 컬럼 연결
+                symptom = row.get('반응') if '반응' in df.columns else row.get('증상', '-')
+                cause = row.get('증상') if '반응' in df.columns else row.get('원인', '-') 
+
+                # 리스트 형태로 깔끔하게 표시
+                with st.container():
+                    c1, c2 = st.columns([1, 2])
+                    with c1:
+                        st.markdown(f"**🔥 나타나는 반응**")
+                        st.warning(symptom) # 강조를 위해 warning 박스 사용
+                    with c2:
+                        st.markdown(f"**🧐 원인 및 분석**")
+                        st.info(cause)      # 정보는 info 박스 사용
+
+                    # 추가 가이드 (대처 등)
+                    extra_solution = row.get('대처') or row.get('호전반응')
+                    if extra_solution:
+                        with st.expander("💡 추가 가이드", expanded=False):
+                            st.write(extra_solution)
+
+                    st.divider() # 구분선 추가
+
+        else:
+            st.warning("해당 부위에 대한 상세 데이터가 없습니다.")
+
+# 맛 버튼도 누른 결과만 이 부분에서 다시 그립니다
+@st.fragment
+def _render_taste_buttons(taste_map):
+    cols = st.columns(2)
+    for i, (t, s) in enumerate(taste_map.items()):
+        with cols[i%2]:
+            desc = str(s).replace('\n', '\n\n')
+            if st.button(f"😋 {t}", key=f"t_{i}", use_container_width=True): 
+                st.success(f"**{t}** 👉 {desc}")
+
 def render_diagnosis(all_sheets):
     try:
         apply_custom_styles()
@@ -108,13 +187,8 @@ def render_diagnosis(all_sheets):
 
     # --- [탭 1] 부위별 반응 ---
     with sub1:
-        target_sheet = None
-        possible_names = ['액티바이즈', '액티증상', '호전반응', '반응']
-        
-        for name in possible_names:
-            target_sheet = get_sheet_data(all_sheets, name)
-            if target_sheet is not None:
-                break
+        # 시트 이름 후보('액티바이즈', '액티증상', '호전반응', '반응')는 utils.SHEET_ROLES에서 관리
+        target_sheet = get_sheet_data(all_sheets, "activize")
         
         if target_sheet is not None:
             df = target_sheet.fillna("")
@@ -123,71 +197,7 @@ def render_diagnosis(all_sheets):
             part_col = '구분' if '구분' in df.columns else ('부위' if '부위' in df.columns else None)
             
             if part_col:
-                parts = df[part_col].unique().tolist()
-                
-                st.write("### 👇 부위를 선택하세요")
-                
-                # 메뉴바(알약) 스타일
-                try:
-                    selected_part = st.pills(
-                        label="부위 선택",
-                        options=parts,
-                        default=parts[0] if parts else None,
-                        selection_mode="single",
-                        label_visibility="collapsed"
-                    )
-                except AttributeError:
-                    selected_part = st.radio(
-                        "부위 선택",
-                        options=parts,
-                        horizontal=True,
-                        label_visibility="collapsed"
-                    )
-
-                st.markdown("---")
-
-                if selected_part:
-                    filtered_df = df[df[part_col] == selected_part]
-                    
-                    if not filtered_df.empty:
-                        # [핵심 수정 1] 대표 이미지 출력 (첫 번째 행의 이미지 사용)
-                        first_row = filtered_df.iloc[0]
-                        rep_image = first_row.get('이미지')
-                        
-                        if rep_image and str(rep_image).strip() != "":
-                            # 이미지를 중앙에 적당한 크기로 배치
-                            c_img1, c_img2, c_img3 = st.columns([1, 2, 1])
-                            with c_img2:
-                                st.image(get_optimized_image(rep_image), use_container_width=True)
-                        
-                        st.markdown(f"### 📍 {selected_part} 상세 분석")
-                        
-                        # [핵심 수정 2] 텍스트 리스트 출력
-                        for idx, row in filtered_df.iterrows():
-                            # 컬럼 연결
-                            symptom = row.get('반응') if '반응' in df.columns else row.get('증상', '-')
-                            cause = row.get('증상') if '반응' in df.columns else row.get('원인', '-') 
-                            
-                            # 리스트 형태로 깔끔하게 표시
-                            with st.container():
-                                c1, c2 = st.columns([1, 2])
-                                with c1:
-                                    st.markdown(f"**🔥 나타나는 반응**")
-                                    st.warning(symptom) # 강조를 위해 warning 박스 사용
-                                with c2:
-                                    st.markdown(f"**🧐 원인 및 분석**")
-                                    st.info(cause)      # 정보는 info 박스 사용
-                                
-                                # 추가 가이드 (대처 등)
-                                extra_solution = row.get('대처') or row.get('호전반응')
-                                if extra_solution:
-                                    with st.expander("💡 추가 가이드", expanded=False):
-                                        st.write(extra_solution)
-                                
-                                st.divider() # 구분선 추가
-
-                    else:
-                        st.warning("해당 부위에 대한 상세 데이터가 없습니다.")
+                _render_part_reactions(df, part_col)
             else:
                 st.error(f"엑셀 파일에 '구분' 또는 '부위' 컬럼이 없습니다.")
         else:
@@ -195,13 +205,7 @@ def render_diagnosis(all_sheets):
 
     # --- [탭 2] 맛 체크 ---
     with sub2:
-        target_taste = None
-        possible_taste_names = ['맛', '맛체크', '맛반응']
-        
-        for name in possible_taste_names:
-            target_taste = get_sheet_data(all_sheets, name)
-            if target_taste is not None:
-                break
+        target_taste = get_sheet_data(all_sheets, "taste")
 
         if target_taste is not None:
             df_t = target_taste.fillna("")
@@ -210,12 +214,7 @@ def render_diagnosis(all_sheets):
                 # 첫 번째 열: 맛, 두 번째 열: 설명
                 taste_map = dict(zip(df_t.iloc[:,0], df_t.iloc[:,1]))
                 
-                cols = st.columns(2)
-                for i, (t, s) in enumerate(taste_map.items()):
-                    with cols[i%2]:
-                        desc = str(s).replace('\n', '\n\n')
-                        if st.button(f"😋 {t}", key=f"t_{i}", use_container_width=True): 
-                            st.success(f"**{t}** 👉 {desc}")
+                _render_taste_buttons(taste_map)
             else:
                 st.warning("엑셀 오류: '맛' 시트에는 최소 2개의 열(맛 종류, 설명)이 필요합니다.")
         else:
@@ -1,17 +1,57 @@
 # view_stories.py (체험사례 및 성공사례)
 import streamlit as st
-from utils import get_optimized_image
+import numpy as np
+import pandas as pd
+from utils import get_optimized_image, get_excel_version
+from components import youtube_player
+from func import get_raw_sheet
 
+# --------------------------------------------------------------------------
+# [0] 체험사례 카테고리 색인 (엑셀 버전별로 1번만 계산)
+# --------------------------------------------------------------------------
+# 체험사례 시트는 매우 크므로 한 번에 STORIES_PAGE_SIZE개씩만 보여주고 '더 보기'로 이어 붙입니다.
+# 카테고리별 행 위치를 미리 묶어 두어서, 고를 때마다 시트 전체를 복사/비교하지 않습니다.
+STORIES_PAGE_SIZE = 10
+STORY_CATEGORY_COLUMN = '카테고리'
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def build_story_index(version, _target_sheet):
+    positions = {"전체": np.arange(len(_target_sheet))}
+    if STORY_CATEGORY_COLUMN in _target_sheet.columns:
+        # 카테고리 -> 행 위치 배열 (시트에 처음 나온 순서대로)
+        codes, categories = pd.factorize(_target_sheet[STORY_CATEGORY_COLUMN].fillna(""))
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+        for code, category in enumerate(categories):
+            positions[category] = order[bounds[code]:bounds[code + 1]]
+    return {"positions": positions, "counts": {category: len(rows) for category, rows in positions.items()}}
+
+def _reset_story_limit():
+    st.session_state.story_limit = STORIES_PAGE_SIZE
+
+def _show_more_stories():
+    st.session_state.story_limit += STORIES_PAGE_SIZE
+
+# --------------------------------------------------------------------------
+# [1] 체험사례 화면
+# --------------------------------------------------------------------------
 def render_experience(all_sheets):
     st.markdown("## 💬 생생한 제품 체험 사례")
-    target_sheet = all_sheets.get('체험사례') if all_sheets else None
+    target_sheet = get_raw_sheet(all_sheets, "stories")
     if target_sheet is not None:
-        df = target_sheet.fillna("")
-        categories = ["전체"] + list(df['카테고리'].unique()) if '카테고리' in df.columns else ["전체"]
-        selected_cat = st.selectbox("증상별/제품별 모아보기", categories)
-        if selected_cat != "전체": df = df[df['카테고리'] == selected_cat]
+        story_index = build_story_index(get_excel_version(all_sheets), target_sheet)
+        category_counts = story_index["counts"]
+        selected_cat = st.selectbox(
+            "증상별/제품별 모아보기", list(category_counts.keys()), on_change=_reset_story_limit,
+            format_func=lambda cat: f"{cat} ({category_counts[cat]})"
+        )
+        if "story_limit" not in st.session_state: _reset_story_limit()
+
+        positions = story_index["positions"].get(selected_cat, story_index["positions"]["전체"])
+        total_count = len(positions)
+        df = target_sheet.iloc[positions[:st.session_state.story_limit]].fillna("") # 지금 보여줄 만큼만
 
-        for _, row in df.iterrows():
+        for row_label, row in df.iterrows():
             with st.container():
                 st.markdown(f"""
                 <div style="border:1px solid #e0e0e0; border-radius:10px; padding:20px; margin-bottom:20px; background-color:white;">
@@ -20,19 +60,23 @@ def render_experience(all_sheets):
                     <div style="color:#666; font-size:14px; margin-bottom:15px;">👤 {row.get('국가/나이/성별','-')} | 💊 {row.get('섭취제품','-')}</div>
                     <div style="background-color:#f9f9f9; padding:15px; border-radius:5px; margin-bottom:15px;">{row.get('내용/후기','-')}</div>
                 </div>""", unsafe_allow_html=True)
-                if row.get('유튜브') and str(row['유튜브']).startswith('http'): st.video(str(row['유튜브']))
+                if row.get('유튜브') and str(row['유튜브']).startswith('http'): youtube_player(row['유튜브'], key=f"story_{row_label}")
+
+        st.caption(f"{len(df)} / {total_count}개 사례")
+        if len(df) < total_count:
+            st.button("⬇️ 사례 더 보기", on_click=_show_more_stories, use_container_width=True)
     else: st.info("체험 사례 데이터가 없습니다.")
 
 def render_success(all_sheets):
     st.markdown("## 🏆 명예의 전당 (성공 스토리)")
-    target_sheet = all_sheets.get('성공사례') if all_sheets else None
+    target_sheet = get_raw_sheet(all_sheets, "success")
     if target_sheet is not None:
         df = target_sheet.fillna("")
-        for _, row in df.iterrows():
+        for row_label, row in df.iterrows():
             with st.expander(f"👑 {row.get('이름')} {row.get('직급')} ({row.get('전직업')})", expanded=True):
                 c1, c2 = st.columns(2)
                 with c1: st.write(f"**⏱ 달성:** {row.get('달성기간')}"); st.write(f"**💼 전직업:** {row.get('전직업')}")
                 with c2: st.write(f"**🚀 동기:** {row.get('시작동기')}")
                 st.write("---"); st.write(f"**😥 애로사항:**\n{row.get('애로사항')}"); st.write(f"**💡 노하우:**\n{row.get('극복노하우')}")
-                if row.get('유튜브') and str(row['유튜브']).startswith('http'): st.video(str(row['유튜브']))
+                if row.get('유튜브') and str(row['유튜브']).startswith('http'): youtube_player(row['유튜브'], key=f"success_{row_label}")
     else: st.info("성공 사례 데이터가 없습니다.")
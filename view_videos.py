@@ -1,6 +1,74 @@
 import streamlit as st
 import pandas as pd
+from components import youtube_player
+from utils import get_excel_version
+from func import get_raw_sheet
 
+# --------------------------------------------------------------------------
+# [0] 아침방송 색인 (엑셀 버전별로 1번만 정렬/묶음)
+# --------------------------------------------------------------------------
+# 예전에는 화면을 그릴 때마다 시트 전체를 날짜순으로 정렬하고 모든 영상을 한 번에 보여줬습니다.
+# 이제 날짜를 미리 변환/정렬해 두고, 월별 또는 주별로 나눠 한 묶음씩만 보여줍니다.
+VIDEO_PERIODS = {"월별": "M", "주별": "W-SUN"}   # 주별: 월요일 ~ 일요일
+
+def _period_label(period, freq):
+    if freq == "M":
+        return f"{period.year}년 {period.month}월"
+    return f"{period.start_time:%Y.%m.%d} ~ {period.end_time:%m.%d}"
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def build_broadcast_index(version, _video_df):
+    df = _video_df.copy()
+    if "날짜" in df.columns:
+        df["_date"] = pd.to_datetime(df["날짜"], errors="coerce")
+    else:
+        df["_date"] = pd.NaT
+    # 최신 날짜가 위로 (날짜가 없는 행은 엑셀 순서대로 맨 뒤)
+    df = df.sort_values(by="_date", ascending=False, na_position="last", kind="stable").reset_index(drop=True)
+
+    # 기간 -> [시작 위치, 끝 위치) (정렬돼 있으므로 같은 기간은 붙어 있음)
+    periods = {}
+    for mode, freq in VIDEO_PERIODS.items():
+        groups = []
+        for position, date in enumerate(df["_date"]):
+            if pd.isna(date):
+                key, label, start = None, "날짜 없음", None
+            else:
+                period = date.to_period(freq)
+                key, label, start = period, _period_label(period, freq), period.start_time.date()
+            if groups and groups[-1]["key"] == key:
+                groups[-1]["end"] = position + 1
+            else:
+                groups.append({"key": key, "label": label, "first_day": start, "start": position, "end": position + 1})
+        periods[mode] = groups
+
+    return {"df": df, "latest": df.iloc[0] if len(df) else None, "periods": periods}
+
+def get_latest_broadcast(all_sheets):
+    """가장 최근 아침방송 1건 (없으면 None)"""
+    video_df = get_raw_sheet(all_sheets, "videos")
+    if video_df is None:
+        return None
+    return build_broadcast_index(get_excel_version(all_sheets), video_df)["latest"]
+
+def format_broadcast_date(row):
+    date = row.get("_date")
+    return f"{date:%Y-%m-%d}" if not pd.isna(date) else row.get("날짜", "-")
+
+def _jump_to_date(mode, groups):
+    # 고른 날짜가 들어 있는(없으면 그보다 이전의 가장 가까운) 기간으로 이동
+    target_day = st.session_state.video_jump_date
+    if target_day is None:
+        return
+    for group in groups:
+        if group["first_day"] is not None and group["first_day"] <= target_day:
+            st.session_state[f"video_period_{mode}"] = group["label"]
+            return
+    st.session_state[f"video_period_{mode}"] = groups[-1]["label"]
+
+# --------------------------------------------------------------------------
+# [1] 영상 자료실 화면
+# --------------------------------------------------------------------------
 def render_video_page(all_sheets):
     st.title("📺 PM 영상 자료실")
     st.caption("매일 아침 조회 및 주요 교육 영상을 확인하세요.")
@@ -8,39 +76,60 @@ def render_video_page(all_sheets):
 
     # 1. 엑셀에서 '아침방송' 시트 데이터 가져오기
     # (데이터가 없거나 시트 이름이 틀렸을 때를 대비한 안전장치)
-    if all_sheets is None or "아침방송" not in all_sheets:
+    video_df = get_raw_sheet(all_sheets, "videos")
+    if video_df is None:
         st.info("📂 아직 등록된 영상 데이터가 없습니다. (엑셀 '아침방송' 시트 확인)")
         return
 
-    df = all_sheets["아침방송"]
-
     # 2. 데이터가 비어있는지 확인
-    if df.empty:
+    if video_df.empty:
         st.info("📭 등록된 영상이 없습니다.")
         return
 
-    # 3. 최신 날짜가 위로 오도록 정렬 (날짜 형식이 올바르다면)
-    try:
-        df = df.sort_values(by="날짜", ascending=False)
-    except:
-        pass # 날짜 형식이 아니면 그냥 엑셀 순서대로 보여줌
+    # 3. 날짜순으로 미리 정렬된 목록에서 기간(월/주) 하나만 골라 보여주기
+    broadcast_index = build_broadcast_index(get_excel_version(all_sheets), video_df)
+    df = broadcast_index["df"]
+
+    c1, c2 = st.columns([1, 1])
+    with c1:
+        mode = st.radio("보기", list(VIDEO_PERIODS.keys()), horizontal=True, key="video_period_mode")
+    groups = broadcast_index["periods"][mode]
+    labels = [group["label"] for group in groups]
+    period_key = f"video_period_{mode}"
+    if st.session_state.get(period_key) not in labels:
+        st.session_state[period_key] = labels[0]
+    with c2:
+        dated_days = df["_date"].dropna()
+        if not dated_days.empty:
+            st.date_input(
+                "📅 날짜로 이동", value=None, key="video_jump_date",
+                min_value=dated_days.min().date(), max_value=dated_days.max().date(),
+                on_change=_jump_to_date, args=(mode, groups)
+            )
+    group_by_label = {group["label"]: group for group in groups}
+    selected = st.selectbox(
+        "기간", labels, key=period_key,
+        format_func=lambda label: f"{label} ({group_by_label[label]['end'] - group_by_label[label]['start']}개)"
+    )
+    group = group_by_label[selected]
 
     # 4. 영상 목록 보여주기 (2단 그리드 디자인)
     # 모바일에서도 보기 좋게 2열로 배치합니다.
-    cols = st.columns(2) 
-    
-    for index, row in df.iterrows():
+    cols = st.columns(2)
+
+    for position in range(group["start"], group["end"]):
+        row = df.iloc[position]
         # 왼쪽, 오른쪽 번갈아가며 배치
-        with cols[index % 2]:
+        with cols[(position - group["start"]) % 2]:
             with st.container(border=True): # 깔끔한 카드 디자인
-                # 유튜브 영상 플레이어
+                # 유튜브 영상 (썸네일 -> 누르면 재생)
                 video_url = str(row.get("링크", "")).strip()
-                
+
                 if "http" in video_url:
-                    st.video(video_url)
+                    youtube_player(video_url, key=f"videos_{position}")
                 else:
                     st.error("잘못된 링크입니다.")
 
                 # 영상 제목 및 날짜
                 st.write(f"**{row.get('설명', '제목 없음')}**")
-                st.caption(f"📅 {row.get('날짜', '-')}")
+                st.caption(f"📅 {format_broadcast_date(row)}")